@@ -3,56 +3,143 @@ ComfyUI Replicate API 整合模組
 支援多種 Replicate 平台上的模型
 """
 
+import json
+import logging
 import os
-from .replicate_nodes import NODE_CLASS_MAPPINGS, NODE_DISPLAY_NAME_MAPPINGS
+import re
+import tempfile
+
+_log = logging.getLogger("comfyui.replicate")
+
+# 模組載入時計算一次 (__file__ 在一般匯入下已是絕對路徑)
+_PLUGIN_DIR = os.path.dirname(__file__)
+_ENV_PATH = os.path.join(_PLUGIN_DIR, '.env')
+
+# .env 解析結果快取檔 (以 .env 的 mtime/size 作為鍵)
+_ENV_CACHE_NAME = '.env.cache'
+_ENV_CACHE_PATH = os.path.join(_PLUGIN_DIR, _ENV_CACHE_NAME)
+
+# 比對 `[export ]REPLICATE_API_TOKEN=<token>`，註解行不會被比對到
+_TOKEN_RE = re.compile(rb'^[ \t]*(?:export[ \t]+)?REPLICATE_API_TOKEN[ \t]*=[ \t]*["\']?([^"\'\r\n#]+)', re.M)
+
+
+def _parse_env_token(env_path):
+    """從 .env 檔案解析 REPLICATE_API_TOKEN，找不到時回傳空字串"""
+    with open(env_path, 'rb') as f:
+        data = f.read()
+    m = _TOKEN_RE.search(data)
+    if m:
+        key = m.group(1).decode('utf-8').strip()
+        if key and key != '<paste-your-token-here>':
+            return key
+    return ''
+
+
+def _read_token_cache(cache_path, key):
+    """讀取快取的 token；快取不存在或鍵不符時回傳 None"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('key') == list(key):
+            return cached.get('token', '')
+    except (OSError, ValueError, AttributeError):
+        pass
+    return None
+
+
+def _write_token_cache(cache_path, key, token):
+    """以暫存檔 + os.replace 原子寫入快取"""
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), prefix=_ENV_CACHE_NAME + '.')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'key': list(key), 'token': token}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+# importlib.reload 會保留模組命名空間，因此此旗標在重新載入後仍然有效
+_LOADED = globals().get('_LOADED', False)
 
 # 載入 API token
 def load_api_token():
+    global _LOADED
+    if _LOADED:
+        return
+    _LOADED = True
+    # 環境變數已設定時優先使用，不讀取 .env
+    if os.environ.get('REPLICATE_API_TOKEN'):
+        _log.info("✅ 使用環境變數中的 Replicate API token")
+        return
     try:
-        env_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
-        if os.path.exists(env_path):
-            with open(env_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith('#') or line.startswith('!'):
-                        continue
-                    if 'REPLICATE_API_TOKEN' in line:
-                        if '=' in line:
-                            key = line.split('=', 1)[1].strip().strip('"\'')
-                            if key and key != '<paste-your-token-here>':
-                                os.environ['REPLICATE_API_TOKEN'] = key
-                                print("✅ 已從 .env 檔案載入 Replicate API token")
-                                return
-            print("⚠️ REPLICATE_API_TOKEN 未在 .env 檔案中配置")
-            print("   請編輯 .env 並設定: export REPLICATE_API_TOKEN=<your-token>")
+        if os.path.exists(_ENV_PATH):
+            st = os.stat(_ENV_PATH)
+            key = (st.st_mtime_ns, st.st_size)
+            token = _read_token_cache(_ENV_CACHE_PATH, key)
+            if token is None:
+                token = _parse_env_token(_ENV_PATH)
+                _write_token_cache(_ENV_CACHE_PATH, key, token)
+            if token:
+                os.environ['REPLICATE_API_TOKEN'] = token
+                _log.info("✅ 已從 .env 檔案載入 Replicate API token")
+                return
+            _log.warning("⚠️ REPLICATE_API_TOKEN 未在 .env 檔案中配置\n"
+                         "   請編輯 .env 並設定: export REPLICATE_API_TOKEN=<your-token>")
         else:
-            print("⚠️ 找不到 .env 檔案。請建立一個並設定 REPLICATE_API_TOKEN")
-            print("   從以下網址取得 API token: https://replicate.com/account/api-tokens")
+            _log.warning("⚠️ 找不到 .env 檔案。請建立一個並設定 REPLICATE_API_TOKEN\n"
+                         "   從以下網址取得 API token: https://replicate.com/account/api-tokens")
     except Exception as e:
-        print(f"❌ 載入 API token 時發生錯誤: {e}")
+        _log.error("❌ 載入 API token 時發生錯誤: %s", e)
 
 # 模組載入時載入 API token
 load_api_token()
 
-# 顯示歡迎訊息
-print("=" * 70)
-print("🤖 ComfyUI Replicate API - 通用模型支援 v2.1")
-print("=" * 70)
-print("📦 支援的模型：")
-print("   🎬 影片生成: Sora 2, Veo 3.1, MiniMax, Wan, SVD")
-print("   🎭 唇語同步: Sync Lipsync 2 Pro, Video Retalking")
-print("   🎨 圖片生成: FLUX Schnell, FLUX Dev, Luma Photon")
-print("   🎵 音訊生成: MusicGen")
-print("   ⬆️ 影片增強: Real-ESRGAN")
-print("=" * 70)
-print("✨ 新功能：")
-print("   🎯 動態參數 - 每個模型只顯示相關輸入")
-print("   🔊 音訊輸出 - 獨立的音訊提取與輸出")
-print("   🔄 影片+音訊合併 - 無縫結合影片與音訊")
-print("=" * 70)
-print("🔑 API Tokens: https://replicate.com/account/api-tokens")
-print("📚 文件: https://replicate.com/")
-print("=" * 70)
+# 歡迎訊息 (預先組合成單一字串，一次輸出)
+_BANNER = "\n".join([
+    "=" * 70,
+    "🤖 ComfyUI Replicate API - 通用模型支援 v2.1",
+    "=" * 70,
+    "📦 支援的模型：",
+    "   🎬 影片生成: Sora 2, Veo 3.1, MiniMax, Wan, SVD",
+    "   🎭 唇語同步: Sync Lipsync 2 Pro, Video Retalking",
+    "   🎨 圖片生成: FLUX Schnell, FLUX Dev, Luma Photon",
+    "   🎵 音訊生成: MusicGen",
+    "   ⬆️ 影片增強: Real-ESRGAN",
+    "=" * 70,
+    "✨ 新功能：",
+    "   🎯 動態參數 - 每個模型只顯示相關輸入",
+    "   🔊 音訊輸出 - 獨立的音訊提取與輸出",
+    "   🔄 影片+音訊合併 - 無縫結合影片與音訊",
+    "=" * 70,
+    "🔑 API Tokens: https://replicate.com/account/api-tokens",
+    "📚 文件: https://replicate.com/",
+    "=" * 70,
+])
+
+_PRINTED = False
+
+def _print_banner():
+    """顯示歡迎訊息，每個行程最多一次；設定 COMFY_REPLICATE_QUIET=1 可關閉"""
+    global _PRINTED
+    if _PRINTED:
+        return
+    _PRINTED = True
+    if os.environ.get("COMFY_REPLICATE_QUIET", "0") == "0":
+        _log.info("%s", _BANNER)
+
+# 延遲載入節點模組 (PEP 562)，ComfyUI 實際存取節點映射時才匯入
+def __getattr__(name):
+    if name in ("NODE_CLASS_MAPPINGS", "NODE_DISPLAY_NAME_MAPPINGS"):
+        from . import replicate_nodes as _r
+        _print_banner()
+        globals().update({
+            "NODE_CLASS_MAPPINGS": _r.NODE_CLASS_MAPPINGS,
+            "NODE_DISPLAY_NAME_MAPPINGS": _r.NODE_DISPLAY_NAME_MAPPINGS,
+        })
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ComfyUI 相容性
 __all__ = ['NODE_CLASS_MAPPINGS', 'NODE_DISPLAY_NAME_MAPPINGS']
@@ -4,16 +4,17 @@ This demonstrates the basic API usage without ComfyUI
 """
 
 import os
-import replicate
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
 
 def main():
     """
     Example: Generate a lipsynced video using Replicate API
     """
+    # Imported here so that importing this module stays cheap
+    import replicate
+    from dotenv import load_dotenv
+    
+    # Load environment variables from .env file
+    load_dotenv()
     
     print("=" * 60)
     print("🎬 Replicate Lipsync-2-Pro Example")
@@ -29,8 +30,7 @@ def main():
         print("3. Get token from: https://replicate.com/account/api-tokens")
         return
     
-    # Set the API token
-    os.environ['REPLICATE_API_TOKEN'] = api_token
+    # No need to set os.environ again: load_dotenv() has already populated it
     
     print("✅ API Token loaded")
     print()
@@ -82,15 +82,22 @@ def main():
             print(f"⬇️  Downloading to {output_filename}...")
             
             if hasattr(output, 'read'):
-                # FileOutput object
+                # FileOutput object - iterate chunks when supported
                 with open(output_filename, "wb") as file:
-                    file.write(output.read())
+                    if hasattr(output, '__iter__'):
+                        for chunk in output:
+                            file.write(chunk)
+                    else:
+                        file.write(output.read())
             else:
-                # URL string - download using requests
+                # URL string - stream to disk using requests
                 import requests
-                response = requests.get(result_url)
-                with open(output_filename, "wb") as file:
-                    file.write(response.content)
+                with requests.get(result_url, stream=True, timeout=60) as response:
+                    response.raise_for_status()
+                    with open(output_filename, "wb") as file:
+                        for chunk in response.iter_content(chunk_size=1 << 20):
+                            if chunk:
+                                file.write(chunk)
             
             print(f"✅ Downloaded to: {output_filename}")
         
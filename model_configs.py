@@ -3,7 +3,47 @@ Replicate Model Configurations
 Defines all supported models and their parameters
 """
 
-REPLICATE_MODELS = {
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class ModelConfig:
+    """Immutable configuration for a single Replicate model"""
+    name: str
+    display_name: str
+    category: str
+    description: str
+    inputs: Mapping[str, dict]
+    outputs: Tuple[str, ...]
+    return_type: str
+    has_audio: bool = False
+
+
+# Shared output tuples, referenced by every model spec below
+_OUT_VIDEO = ("video",)
+_OUT_AUDIO = ("audio",)
+_OUT_IMAGE = ("image",)
+_OUT_VIDEO_AUDIO = ("video", "audio")
+_OUT_3D = ("3d",)
+_OUT_JSON = ("json",)
+
+
+# Shared input specs, referenced by identity from the model specs below
+_PROMPT = MappingProxyType({"type": "STRING", "required": True, "multiline": True})
+_IMG_REQ = MappingProxyType({"type": "IMAGE", "required": True})
+_IMG_OPT = MappingProxyType({"type": "IMAGE", "required": False})
+_VIDEO_REQ = MappingProxyType({"type": "VIDEO", "required": True})
+_AUDIO_REQ = MappingProxyType({"type": "AUDIO", "required": True})
+_FLUX_AR = MappingProxyType({"type": "COMBO", "options": ("1:1", "16:9", "9:16", "4:3", "3:4", "21:9", "9:21"), "default": "1:1"})
+_LUMA_AR = MappingProxyType({"type": "COMBO", "options": ("16:9", "9:16", "4:3", "3:4", "1:1"), "default": "16:9"})
+_OUTPUT_FORMAT = MappingProxyType({"type": "COMBO", "options": ("webp", "jpg", "png"), "default": "webp"})
+_OUTPUT_QUALITY = MappingProxyType({"type": "INT", "default": 80, "min": 0, "max": 100, "step": 1})
+
+
+# Raw model specifications, converted to ModelConfig objects below
+_MODEL_SPECS = {
     # ===== Video Generation Models =====
     "sora-2": {
         "name": "openai/sora-2",
@@ -11,11 +51,11 @@ REPLICATE_MODELS = {
         "category": "video/generation",
         "description": "OpenAI's Sora 2 - Advanced text-to-video generation",
         "inputs": {
-            "prompt": {"type": "STRING", "required": True, "multiline": True},
-            "aspect_ratio": {"type": "COMBO", "options": ["portrait", "landscape", "square"], "default": "landscape"},
-            "input_reference": {"type": "IMAGE", "required": False},
+            "prompt": _PROMPT,
+            "aspect_ratio": {"type": "COMBO", "options": ("portrait", "landscape", "square"), "default": "landscape"},
+            "input_reference": _IMG_OPT,
         },
-        "outputs": ["video"],
+        "outputs": _OUT_VIDEO,
         "return_type": "VIDEO",
     },
     
@@ -25,12 +65,12 @@ REPLICATE_MODELS = {
         "category": "video/generation",
         "description": "Google's Veo 3.1 - Fast video generation from image and text",
         "inputs": {
-            "image": {"type": "IMAGE", "required": True},
-            "prompt": {"type": "STRING", "required": True, "multiline": True},
-            "last_frame": {"type": "IMAGE", "required": False},
-            "resolution": {"type": "COMBO", "options": ["480p", "720p", "1080p"], "default": "720p"},
+            "image": _IMG_REQ,
+            "prompt": _PROMPT,
+            "last_frame": _IMG_OPT,
+            "resolution": {"type": "COMBO", "options": ("480p", "720p", "1080p"), "default": "720p"},
         },
-        "outputs": ["video"],
+        "outputs": _OUT_VIDEO,
         "return_type": "VIDEO",
     },
     
@@ -40,11 +80,11 @@ REPLICATE_MODELS = {
         "category": "video/generation",
         "description": "Generate high-quality videos from text prompts",
         "inputs": {
-            "prompt": {"type": "STRING", "required": True, "multiline": True},
-            "first_frame_image": {"type": "IMAGE", "required": False},
+            "prompt": _PROMPT,
+            "first_frame_image": _IMG_OPT,
             "prompt_optimizer": {"type": "BOOLEAN", "default": True},
         },
-        "outputs": ["video"],
+        "outputs": _OUT_VIDEO,
         "return_type": "VIDEO",
     },
     
@@ -54,11 +94,11 @@ REPLICATE_MODELS = {
         "category": "video/generation",
         "description": "High-quality video generation with detailed control",
         "inputs": {
-            "prompt": {"type": "STRING", "required": True, "multiline": True},
-            "quality": {"type": "COMBO", "options": ["480p", "720p", "1080p"], "default": "1080p"},
+            "prompt": _PROMPT,
+            "quality": {"type": "COMBO", "options": ("480p", "720p", "1080p"), "default": "1080p"},
             "duration": {"type": "INT", "default": 8, "min": 1, "max": 30, "step": 1},
         },
-        "outputs": ["video"],
+        "outputs": _OUT_VIDEO,
         "return_type": "VIDEO",
     },
     
@@ -68,10 +108,10 @@ REPLICATE_MODELS = {
         "category": "image/generation",
         "description": "Fast, high-quality image generation",
         "inputs": {
-            "prompt": {"type": "STRING", "required": True, "multiline": True},
-            "aspect_ratio": {"type": "COMBO", "options": ["16:9", "9:16", "4:3", "3:4", "1:1"], "default": "16:9"},
+            "prompt": _PROMPT,
+            "aspect_ratio": _LUMA_AR,
         },
-        "outputs": ["image"],
+        "outputs": _OUT_IMAGE,
         "return_type": "IMAGE",
     },
     
@@ -81,10 +121,10 @@ REPLICATE_MODELS = {
         "category": "image/generation",
         "description": "Ultra-fast image generation",
         "inputs": {
-            "prompt": {"type": "STRING", "required": True, "multiline": True},
-            "aspect_ratio": {"type": "COMBO", "options": ["16:9", "9:16", "4:3", "3:4", "1:1"], "default": "16:9"},
+            "prompt": _PROMPT,
+            "aspect_ratio": _LUMA_AR,
         },
-        "outputs": ["image"],
+        "outputs": _OUT_IMAGE,
         "return_type": "IMAGE",
     },
     
@@ -95,13 +135,13 @@ REPLICATE_MODELS = {
         "category": "video/lipsync",
         "description": "Studio-grade lipsync model for video dubbing",
         "inputs": {
-            "video": {"type": "VIDEO", "required": True},
-            "audio": {"type": "AUDIO", "required": True},
-            "sync_mode": {"type": "COMBO", "options": ["loop", "bounce", "cut_off", "silence", "remap"], "default": "loop"},
+            "video": _VIDEO_REQ,
+            "audio": _AUDIO_REQ,
+            "sync_mode": {"type": "COMBO", "options": ("loop", "bounce", "cut_off", "silence", "remap"), "default": "loop"},
             "temperature": {"type": "FLOAT", "default": 0.5, "min": 0.0, "max": 1.0, "step": 0.1},
             "active_speaker": {"type": "BOOLEAN", "default": False},
         },
-        "outputs": ["video", "audio"],
+        "outputs": _OUT_VIDEO_AUDIO,
         "return_type": "VIDEO",
         "has_audio": True,
     },
@@ -113,13 +153,13 @@ REPLICATE_MODELS = {
         "category": "video/generation",
         "description": "Convert images to videos with motion",
         "inputs": {
-            "image": {"type": "IMAGE", "required": True},
-            "prompt": {"type": "STRING", "required": True, "multiline": True},
+            "image": _IMG_REQ,
+            "prompt": _PROMPT,
             "num_frames": {"type": "INT", "default": 81, "min": 1, "max": 81, "step": 1},
             "guidance_scale": {"type": "FLOAT", "default": 7.5, "min": 1.0, "max": 20.0, "step": 0.5},
             "num_inference_steps": {"type": "INT", "default": 50, "min": 10, "max": 100, "step": 1},
         },
-        "outputs": ["video"],
+        "outputs": _OUT_VIDEO,
         "return_type": "VIDEO",
     },
     
@@ -129,10 +169,10 @@ REPLICATE_MODELS = {
         "category": "video/generation",
         "description": "圖片轉影片 - 將靜態圖片轉換為動態影片 / Image to video conversion",
         "inputs": {
-            "image": {"type": "IMAGE", "required": True},
-            "prompt": {"type": "STRING", "required": True, "multiline": True},
+            "image": _IMG_REQ,
+            "prompt": _PROMPT,
         },
-        "outputs": ["video"],
+        "outputs": _OUT_VIDEO,
         "return_type": "VIDEO",
     },
     
@@ -142,13 +182,13 @@ REPLICATE_MODELS = {
         "category": "video/generation",
         "description": "Generate videos from images using Stable Video Diffusion",
         "inputs": {
-            "image": {"type": "IMAGE", "required": True},
+            "image": _IMG_REQ,
             "motion_bucket_id": {"type": "INT", "default": 127, "min": 1, "max": 255, "step": 1},
             "cond_aug": {"type": "FLOAT", "default": 0.02, "min": 0.0, "max": 1.0, "step": 0.01},
             "decoding_t": {"type": "INT", "default": 14, "min": 1, "max": 100, "step": 1},
             "fps": {"type": "INT", "default": 6, "min": 1, "max": 30, "step": 1},
         },
-        "outputs": ["video"],
+        "outputs": _OUT_VIDEO,
         "return_type": "VIDEO",
     },
     
@@ -159,11 +199,11 @@ REPLICATE_MODELS = {
         "category": "video/generation",
         "description": "Real-time video generation from text",
         "inputs": {
-            "prompt": {"type": "STRING", "required": True, "multiline": True},
-            "first_frame_image": {"type": "IMAGE", "required": False},
+            "prompt": _PROMPT,
+            "first_frame_image": _IMG_OPT,
             "prompt_optimizer": {"type": "BOOLEAN", "default": True},
         },
-        "outputs": ["video"],
+        "outputs": _OUT_VIDEO,
         "return_type": "VIDEO",
     },
     
@@ -173,11 +213,11 @@ REPLICATE_MODELS = {
         "category": "video/generation",
         "description": "快速影片生成 - 高速生成高品質影片 / Fast high-quality video generation",
         "inputs": {
-            "prompt": {"type": "STRING", "required": True, "multiline": True},
+            "prompt": _PROMPT,
             "duration": {"type": "INT", "default": 10, "min": 1, "max": 30, "step": 1},
-            "first_frame_image": {"type": "IMAGE", "required": False},
+            "first_frame_image": _IMG_OPT,
         },
-        "outputs": ["video"],
+        "outputs": _OUT_VIDEO,
         "return_type": "VIDEO",
     },
     
@@ -187,9 +227,9 @@ REPLICATE_MODELS = {
         "category": "video/generation",
         "description": "Sora 2 專業版 - OpenAI 最先進的文字轉影片模型 / OpenAI's most advanced text-to-video model",
         "inputs": {
-            "prompt": {"type": "STRING", "required": True, "multiline": True},
+            "prompt": _PROMPT,
         },
-        "outputs": ["video"],
+        "outputs": _OUT_VIDEO,
         "return_type": "VIDEO",
     },
 
@@ -199,10 +239,10 @@ REPLICATE_MODELS = {
         "category": "video/generation",
         "description": "LTX-2 快速影片生成 - 圖片轉影片 / Fast image-to-video generation",
         "inputs": {
-            "image": {"type": "IMAGE", "required": True},
-            "prompt": {"type": "STRING", "required": True, "multiline": True},
+            "image": _IMG_REQ,
+            "prompt": _PROMPT,
         },
-        "outputs": ["video"],
+        "outputs": _OUT_VIDEO,
         "return_type": "VIDEO",
     },
 
@@ -212,10 +252,10 @@ REPLICATE_MODELS = {
         "category": "video/generation",
         "description": "LTX-2 Pro 圖片轉影片 / Image-to-video generation",
         "inputs": {
-            "image": {"type": "IMAGE", "required": True},
-            "prompt": {"type": "STRING", "required": True, "multiline": True},
+            "image": _IMG_REQ,
+            "prompt": _PROMPT,
         },
-        "outputs": ["video"],
+        "outputs": _OUT_VIDEO,
         "return_type": "VIDEO",
     },
 
@@ -225,10 +265,10 @@ REPLICATE_MODELS = {
         "category": "video/generation",
         "description": "LTX-2 Distilled 圖片轉影片 / Distilled image-to-video generation",
         "inputs": {
-            "image": {"type": "IMAGE", "required": True},
-            "prompt": {"type": "STRING", "required": True, "multiline": True},
+            "image": _IMG_REQ,
+            "prompt": _PROMPT,
         },
-        "outputs": ["video"],
+        "outputs": _OUT_VIDEO,
         "return_type": "VIDEO",
     },
 
@@ -238,10 +278,10 @@ REPLICATE_MODELS = {
         "category": "video/generation",
         "description": "LTX-2.3 快速文字轉影片 / Fast text-to-video generation",
         "inputs": {
-            "prompt": {"type": "STRING", "required": True, "multiline": True},
-            "camera_motion": {"type": "COMBO", "options": ["none", "dolly_in", "dolly_out", "pan_left", "pan_right", "tilt_up", "tilt_down", "roll_cw", "roll_ccw"], "default": "none"},
+            "prompt": _PROMPT,
+            "camera_motion": {"type": "COMBO", "options": ("none", "dolly_in", "dolly_out", "pan_left", "pan_right", "tilt_up", "tilt_down", "roll_cw", "roll_ccw"), "default": "none"},
         },
-        "outputs": ["video"],
+        "outputs": _OUT_VIDEO,
         "return_type": "VIDEO",
     },
 
@@ -251,10 +291,10 @@ REPLICATE_MODELS = {
         "category": "video/generation",
         "description": "Kling v2.1 - 圖片轉影片 / Image-to-video generation",
         "inputs": {
-            "prompt": {"type": "STRING", "required": True, "multiline": True},
-            "start_image": {"type": "IMAGE", "required": False},
+            "prompt": _PROMPT,
+            "start_image": _IMG_OPT,
         },
-        "outputs": ["video"],
+        "outputs": _OUT_VIDEO,
         "return_type": "VIDEO",
     },
 
@@ -264,15 +304,15 @@ REPLICATE_MODELS = {
         "category": "video/generation",
         "description": "Seedance 2.0 - 文字/圖片轉影片 / Text/Image-to-video generation",
         "inputs": {
-            "prompt": {"type": "STRING", "required": True, "multiline": True},
+            "prompt": _PROMPT,
             "seed": {"type": "INT", "required": False, "default": -1, "min": -1, "max": 2147483647, "step": 1},
             "duration": {"type": "INT", "default": 7, "min": 1, "max": 30, "step": 1},
-            "resolution": {"type": "COMBO", "options": ["480p", "720p", "1080p"], "default": "720p"},
-            "aspect_ratio": {"type": "COMBO", "options": ["16:9", "9:16", "1:1", "4:3", "3:4", "21:9", "9:21", "adaptive"], "default": "16:9"},
+            "resolution": {"type": "COMBO", "options": ("480p", "720p", "1080p"), "default": "720p"},
+            "aspect_ratio": {"type": "COMBO", "options": ("16:9", "9:16", "1:1", "4:3", "3:4", "21:9", "9:21", "adaptive"), "default": "16:9"},
             "generate_audio": {"type": "BOOLEAN", "default": True},
             "reference_images": {"type": "IMAGE_LIST", "required": False},
         },
-        "outputs": ["video"],
+        "outputs": _OUT_VIDEO,
         "return_type": "VIDEO",
     },
 
@@ -282,9 +322,9 @@ REPLICATE_MODELS = {
         "category": "video/generation",
         "description": "Seedance 1 Lite - 輕量文字轉影片 / Lightweight text-to-video generation",
         "inputs": {
-            "prompt": {"type": "STRING", "required": True, "multiline": True},
+            "prompt": _PROMPT,
         },
-        "outputs": ["video"],
+        "outputs": _OUT_VIDEO,
         "return_type": "VIDEO",
     },
 
@@ -294,9 +334,9 @@ REPLICATE_MODELS = {
         "category": "video/generation",
         "description": "Seedance 1 Pro - 專業文字轉影片 / Professional text-to-video generation",
         "inputs": {
-            "prompt": {"type": "STRING", "required": True, "multiline": True},
+            "prompt": _PROMPT,
         },
-        "outputs": ["video"],
+        "outputs": _OUT_VIDEO,
         "return_type": "VIDEO",
     },
 
@@ -306,11 +346,11 @@ REPLICATE_MODELS = {
         "category": "video/generation",
         "description": "快速影片生成 - 從圖片和文字生成影片 / Fast video generation from image and text",
         "inputs": {
-            "image": {"type": "IMAGE", "required": True},
-            "prompt": {"type": "STRING", "required": True, "multiline": True},
+            "image": _IMG_REQ,
+            "prompt": _PROMPT,
             "prompt_upsampling": {"type": "BOOLEAN", "default": False},
         },
-        "outputs": ["video"],
+        "outputs": _OUT_VIDEO,
         "return_type": "VIDEO",
     },
 
@@ -321,11 +361,11 @@ REPLICATE_MODELS = {
         "category": "video/enhancement",
         "description": "Audio-based lip synchronization for talking head videos",
         "inputs": {
-            "video": {"type": "VIDEO", "required": True},
-            "audio": {"type": "AUDIO", "required": True},
-            "face": {"type": "IMAGE", "required": False},
+            "video": _VIDEO_REQ,
+            "audio": _AUDIO_REQ,
+            "face": _IMG_OPT,
         },
-        "outputs": ["video"],
+        "outputs": _OUT_VIDEO,
         "return_type": "VIDEO",
     },
     
@@ -335,11 +375,11 @@ REPLICATE_MODELS = {
         "category": "video/enhancement",
         "description": "Upscale videos with Real-ESRGAN",
         "inputs": {
-            "video": {"type": "VIDEO", "required": True},
+            "video": _VIDEO_REQ,
             "scale": {"type": "INT", "default": 2, "min": 1, "max": 4, "step": 1},
             "face_enhance": {"type": "BOOLEAN", "default": False},
         },
-        "outputs": ["video"],
+        "outputs": _OUT_VIDEO,
         "return_type": "VIDEO",
     },
     
@@ -350,12 +390,12 @@ REPLICATE_MODELS = {
         "category": "audio/generation",
         "description": "Generate music from text descriptions",
         "inputs": {
-            "prompt": {"type": "STRING", "required": True, "multiline": True},
+            "prompt": _PROMPT,
             "duration": {"type": "INT", "default": 8, "min": 1, "max": 30, "step": 1},
-            "model_version": {"type": "COMBO", "options": ["stereo-large", "large", "medium", "small"], "default": "stereo-large"},
+            "model_version": {"type": "COMBO", "options": ("stereo-large", "large", "medium", "small"), "default": "stereo-large"},
             "temperature": {"type": "FLOAT", "default": 1.0, "min": 0.0, "max": 2.0, "step": 0.1},
         },
-        "outputs": ["audio"],
+        "outputs": _OUT_AUDIO,
         "return_type": "AUDIO",
     },
     
@@ -365,10 +405,10 @@ REPLICATE_MODELS = {
         "category": "audio/generation",
         "description": "影片轉音效 - 根據影片內容自動生成音效 / Generate sound effects from video content",
         "inputs": {
-            "video_path": {"type": "VIDEO", "required": True},
+            "video_path": _VIDEO_REQ,
             "num_samples": {"type": "INT", "default": 4, "min": 1, "max": 10, "step": 1},
         },
-        "outputs": ["audio"],
+        "outputs": _OUT_AUDIO,
         "return_type": "AUDIO",
     },
 
@@ -378,9 +418,9 @@ REPLICATE_MODELS = {
         "category": "audio/voice-cloning",
         "description": "聲音克隆 - 從音訊樣本克隆聲音 / Clone voice from audio sample",
         "inputs": {
-            "voice_file": {"type": "AUDIO", "required": True},
+            "voice_file": _AUDIO_REQ,
         },
-        "outputs": ["json"],
+        "outputs": _OUT_JSON,
         "return_type": "STRING",
     },
     
@@ -391,12 +431,12 @@ REPLICATE_MODELS = {
         "category": "image/generation",
         "description": "Fast high-quality image generation",
         "inputs": {
-            "prompt": {"type": "STRING", "required": True, "multiline": True},
-            "aspect_ratio": {"type": "COMBO", "options": ["1:1", "16:9", "9:16", "4:3", "3:4", "21:9", "9:21"], "default": "1:1"},
-            "output_format": {"type": "COMBO", "options": ["webp", "jpg", "png"], "default": "webp"},
-            "output_quality": {"type": "INT", "default": 80, "min": 0, "max": 100, "step": 1},
+            "prompt": _PROMPT,
+            "aspect_ratio": _FLUX_AR,
+            "output_format": _OUTPUT_FORMAT,
+            "output_quality": _OUTPUT_QUALITY,
         },
-        "outputs": ["image"],
+        "outputs": _OUT_IMAGE,
         "return_type": "IMAGE",
     },
     
@@ -406,14 +446,14 @@ REPLICATE_MODELS = {
         "category": "image/generation",
         "description": "High-quality image generation with more control",
         "inputs": {
-            "prompt": {"type": "STRING", "required": True, "multiline": True},
-            "aspect_ratio": {"type": "COMBO", "options": ["1:1", "16:9", "9:16", "4:3", "3:4", "21:9", "9:21"], "default": "1:1"},
+            "prompt": _PROMPT,
+            "aspect_ratio": _FLUX_AR,
             "guidance": {"type": "FLOAT", "default": 3.5, "min": 1.5, "max": 5.0, "step": 0.1},
             "num_inference_steps": {"type": "INT", "default": 28, "min": 1, "max": 50, "step": 1},
-            "output_format": {"type": "COMBO", "options": ["webp", "jpg", "png"], "default": "webp"},
-            "output_quality": {"type": "INT", "default": 80, "min": 0, "max": 100, "step": 1},
+            "output_format": _OUTPUT_FORMAT,
+            "output_quality": _OUTPUT_QUALITY,
         },
-        "outputs": ["image"],
+        "outputs": _OUT_IMAGE,
         "return_type": "IMAGE",
     },
 
@@ -424,41 +464,70 @@ REPLICATE_MODELS = {
         "category": "3d/generation",
         "description": "3D模型生成 - 從文字生成3D模型 / Generate 3D models from text",
         "inputs": {
-            "prompt": {"type": "STRING", "required": True, "multiline": True},
+            "prompt": _PROMPT,
         },
-        "outputs": ["3d"],
+        "outputs": _OUT_3D,
         "return_type": "FILE",
     },
 }
 
 
+def _freeze_spec(spec):
+    """Build a ModelConfig whose inputs mapping and input specs are read-only"""
+    inputs = MappingProxyType({
+        name: input_spec if isinstance(input_spec, MappingProxyType) else MappingProxyType(input_spec)
+        for name, input_spec in spec["inputs"].items()
+    })
+    return ModelConfig(**{**spec, "inputs": inputs})
+
+
+# Read-only view; safe to share across nodes and threads without copying
+REPLICATE_MODELS = MappingProxyType({
+    model_id: _freeze_spec(spec) for model_id, spec in _MODEL_SPECS.items()
+})
+
+# The raw literal is import-time scaffolding only; the frozen table above is
+# the single source of truth. Bytecode for this module is already cached by
+# Python in __pycache__, so no separate serialized sidecar is needed.
+del _MODEL_SPECS
+
+# Lookup tables derived once at import time
+MODEL_IDS = frozenset(REPLICATE_MODELS)
+_MODEL_NAMES = tuple(REPLICATE_MODELS)
+_MODEL_CHOICES = tuple((v.display_name, k) for k, v in REPLICATE_MODELS.items())
+_ALL_CATEGORIES = tuple(sorted({v.category for v in REPLICATE_MODELS.values()}))
+
+_by_category = {}
+for _model_id, _config in REPLICATE_MODELS.items():
+    _by_category.setdefault(_config.category, {})[_model_id] = _config
+_BY_CATEGORY = MappingProxyType({c: MappingProxyType(m) for c, m in _by_category.items()})
+_EMPTY_CATEGORY = MappingProxyType({})
+del _by_category, _model_id, _config
+
+
 def get_model_config(model_id):
     """Get configuration for a specific model"""
-    return REPLICATE_MODELS.get(model_id)
+    return REPLICATE_MODELS[model_id] if model_id in MODEL_IDS else None
 
 
 def get_models_by_category(category):
     """Get all models in a specific category"""
-    return {k: v for k, v in REPLICATE_MODELS.items() if v.get("category") == category}
+    return _BY_CATEGORY.get(category, _EMPTY_CATEGORY)
 
 
 def get_all_categories():
     """Get list of all available categories"""
-    categories = set()
-    for model in REPLICATE_MODELS.values():
-        if "category" in model:
-            categories.add(model["category"])
-    return sorted(list(categories))
+    return list(_ALL_CATEGORIES)
 
 
 def get_model_choices():
-    """Get list of model choices for ComfyUI dropdown"""
-    return [(v["display_name"], k) for k, v in REPLICATE_MODELS.items()]
+    """Get tuple of model choices for ComfyUI dropdown (shared, do not copy per call)"""
+    return _MODEL_CHOICES
 
 
 def get_model_names():
-    """Get list of model names for ComfyUI"""
-    return list(REPLICATE_MODELS.keys())
+    """Get tuple of model names for ComfyUI (shared, do not copy per call)"""
+    return _MODEL_NAMES
 
 
 # Category groups for node organization
@@ -474,4 +543,4 @@ CATEGORY_GROUPS = {
 def get_model_names_by_group(group_key):
     """Get model names for a category group"""
     prefixes = CATEGORY_GROUPS.get(group_key, [])
-    return [k for k, v in REPLICATE_MODELS.items() if v.get("category") in prefixes]
+    return [k for k, v in REPLICATE_MODELS.items() if v.category in prefixes]
@@ -3,12 +3,33 @@ Replicate API 整合模組 for ComfyUI
 支援多種 Replicate 平台上的模型
 """
 
+import contextlib
+import datetime
+import functools
+import hashlib
+import itertools
+import json
+import logging
+import mimetypes
 import os
 import time
 import replicate
 import requests
+import shutil
+import sqlite3
+import subprocess
 import tempfile
+import threading
+import urllib3
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# 完整 traceback 僅在 DEBUG 等級輸出；設定 REPLICATE_DEBUG=1 可開啟
+_log = logging.getLogger("comfyui.replicate.api")
+if os.environ.get("REPLICATE_DEBUG") == "1":
+    _log.setLevel(logging.DEBUG)
 
 # 嘗試載入 model_configs
 try:
@@ -18,14 +39,27 @@ except ImportError:
     HAS_MODEL_CONFIGS = False
     REPLICATE_MODELS = {}
 
-# Load environment variables
-load_dotenv()
+# 模型設定為不可變物件，可安全快取查詢結果 (lru_cache 以 C 實作，省去 Python 函式呼叫)
+if HAS_MODEL_CONFIGS:
+    _get_cfg = functools.lru_cache(maxsize=128)(get_model_config)
+else:
+    def _get_cfg(model_id):
+        return None
 
-# Also try to load from the plugin directory
+# Load environment variables once (prefer the plugin-local .env, otherwise search upwards).
+# Skipped when the token is already exported or on module reload.
 plugin_dir = os.path.dirname(os.path.abspath(__file__))
 dotenv_path = os.path.join(plugin_dir, '.env')
-if os.path.exists(dotenv_path):
-    load_dotenv(dotenv_path)
+if not globals().get('_dotenv_loaded') and not os.environ.get('REPLICATE_API_TOKEN'):
+    load_dotenv(dotenv_path if os.path.exists(dotenv_path) else None, override=False)
+_dotenv_loaded = True
+
+# 可選：requests-toolbelt 提供串流 multipart 上傳
+try:
+    from requests_toolbelt import MultipartEncoder
+    HAS_TOOLBELT = True
+except ImportError:
+    HAS_TOOLBELT = False
 
 # Try to import ComfyUI's folder_paths, use fallback if not available
 try:
@@ -39,6 +73,256 @@ except ImportError:
     folder_paths = FolderPaths()
 
 
+# 下載時每次讀寫的區塊大小 (1 MiB)
+_DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# 輸出檔名後綴：以啟動時間為起點遞增，同一秒內多次輸出也不會互相覆蓋
+_name_counter = itertools.count(int(time.time()))
+
+# 下載串流中斷時最多續傳次數
+_DOWNLOAD_MAX_RESUMES = 3
+
+# Replicate 檔案上傳端點
+_FILES_ENDPOINT = "https://api.replicate.com/v1/files"
+
+# 上傳重試設定 (POST 不走 urllib3 Retry，於 upload_file 內自行重試)
+_UPLOAD_ATTEMPTS = 3
+_UPLOAD_BACKOFF_BASE = 1.0
+_UPLOAD_BACKOFF_MAX = 10.0
+_UPLOAD_RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+# Replicate 檔案端點單檔上限
+_UPLOAD_MAX_BYTES = 100 * 1024 * 1024
+
+# 已上傳檔案 URL 快取：{內容雜湊: (url, 到期時間)}，以內容而非路徑為鍵
+# 到期時間採用 /v1/files 回應的 expires_at；回應未提供時假設 24 小時
+_UPLOAD_DEFAULT_LIFETIME = 24 * 3600
+# URL 在到期前這段時間內即視為失效，確保模型執行期間 URL 仍然有效
+_UPLOAD_EXPIRY_MARGIN = 3600
+_upload_cache = {}
+# URL -> 到期時間，讓 cache_upload 以自訂內容鍵記錄時沿用同一個到期時間
+_url_expires_at = {}
+_upload_cache_lock = threading.Lock()
+
+# 快取同時寫入 sqlite，ComfyUI 重新啟動後仍可沿用尚未過期的 URL
+_UPLOAD_CACHE_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.upload_cache.sqlite3')
+
+# 可選：BLAKE3 比 SHA-256 快數倍（多核 SIMD），未安裝時退回 hashlib
+try:
+    import blake3
+    HAS_BLAKE3 = True
+except ImportError:
+    HAS_BLAKE3 = False
+
+
+def _hash_file(file_path):
+    """計算檔案內容雜湊，回傳帶演算法前綴的字串（blake3:… 或 sha256:…）"""
+    if HAS_BLAKE3:
+        hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+        hasher.update_mmap(file_path)
+        return "blake3:" + hasher.hexdigest()
+    with open(file_path, 'rb') as f:
+        # Python 3.11+ 使用 hashlib.file_digest 直接交給 OpenSSL
+        if hasattr(hashlib, 'file_digest'):
+            return "sha256:" + hashlib.file_digest(f, 'sha256').hexdigest()
+        h = hashlib.sha256()
+        buf = bytearray(_DOWNLOAD_CHUNK_SIZE)
+        view = memoryview(buf)
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            h.update(view[:n])
+        return "sha256:" + h.hexdigest()
+
+
+def _parse_expires_at(value):
+    """將 expires_at（ISO 8601 字串或 datetime）轉為 epoch 秒；無法解析時回傳 None"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            value = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return value.timestamp()
+    return None
+
+
+def _open_upload_cache_db():
+    conn = sqlite3.connect(_UPLOAD_CACHE_DB, timeout=5)
+    # 舊版以上傳時間 + 固定 TTL 記錄的資料表不含伺服器到期時間，直接捨棄
+    conn.execute("DROP TABLE IF EXISTS uploads")
+    conn.execute("CREATE TABLE IF NOT EXISTS upload_urls (key TEXT PRIMARY KEY, url TEXT NOT NULL, expires_at REAL NOT NULL)")
+    return conn
+
+
+def _upload_cache_get(key):
+    """查詢尚未接近到期的已上傳 URL：先查記憶體，再查 sqlite；找不到時回傳 None"""
+    with _upload_cache_lock:
+        cached = _upload_cache.get(key)
+    if cached is None:
+        try:
+            with contextlib.closing(_open_upload_cache_db()) as conn:
+                row = conn.execute("SELECT url, expires_at FROM upload_urls WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            row = None
+        if row is None:
+            return None
+        cached = (row[0], row[1])
+        with _upload_cache_lock:
+            _upload_cache[key] = cached
+            _url_expires_at[cached[0]] = cached[1]
+    if time.time() >= cached[1] - _UPLOAD_EXPIRY_MARGIN:
+        return None
+    return cached[0]
+
+
+def _upload_cache_put(key, url, expires_at):
+    """記錄已上傳 URL 與其到期時間（epoch 秒），同時清除已過期的項目"""
+    now = time.time()
+    with _upload_cache_lock:
+        _upload_cache[key] = (url, expires_at)
+        _url_expires_at[url] = expires_at
+        for stale in [u for u, exp in _url_expires_at.items() if exp <= now]:
+            del _url_expires_at[stale]
+    try:
+        with contextlib.closing(_open_upload_cache_db()) as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO upload_urls (key, url, expires_at) VALUES (?, ?, ?)", (key, url, expires_at))
+            conn.execute("DELETE FROM upload_urls WHERE expires_at < ?", (now,))
+    except sqlite3.Error as e:
+        _log.debug("upload cache write failed: %s", e)
+
+
+def _is_retryable_upload_error(exc):
+    """連線/逾時錯誤或 429/5xx 回應視為暫時性錯誤"""
+    if isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    status = getattr(getattr(exc, 'response', None), 'status_code', None)
+    if status is None:
+        # replicate.exceptions.ReplicateError 以 status 屬性帶回 HTTP 狀態碼
+        status = getattr(exc, 'status', None)
+    return status in _UPLOAD_RETRY_STATUS
+
+
+# 預測狀態輪詢間隔（秒），與 replicate 套件相同的環境變數
+_POLL_INTERVAL = float(os.environ.get("REPLICATE_POLL_INTERVAL", "0.5"))
+# 單一預測最長等待時間（秒）；逾時會取消該預測
+_PREDICTION_TIMEOUT = float(os.environ.get("REPLICATE_PREDICTION_TIMEOUT", "3600"))
+_TERMINAL_STATUSES = frozenset({"succeeded", "failed", "canceled"})
+# 同一輪詢週期內同時 reload 的上限
+_POLL_MAX_WORKERS = 8
+
+
+class _PredictionPoller:
+    """
+    所有節點共用的預測輪詢執行緒
+    每個間隔只 reload 目前追蹤中的預測（依 ID），多個預測時以執行緒池並行查詢
+    輪詢迴圈意外結束時，等待中的呼叫端會收到該例外，下一次 wait 會重新啟動執行緒
+    """
+    
+    def __init__(self, interval):
+        self._interval = interval
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._executor = None
+    
+    def wait(self, prediction, timeout):
+        """登記預測並阻塞至結束，回傳已 reload 的最終 prediction；逾時時取消預測並拋出 TimeoutError"""
+        future = Future()
+        with self._lock:
+            self._pending[prediction.id] = (prediction, future)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="replicate-poller", daemon=True)
+                self._thread.start()
+        try:
+            return future.result(timeout=timeout)
+        except FuturesTimeoutError:
+            with self._lock:
+                self._pending.pop(prediction.id, None)
+            try:
+                prediction.cancel()
+            except Exception as e:
+                _log.debug("cancel of prediction %s failed: %s", prediction.id, e)
+            raise TimeoutError(f"預測 {prediction.id} 超過 {timeout:.0f} 秒未完成，已取消") from None
+    
+    def _run(self):
+        try:
+            while True:
+                time.sleep(self._interval)
+                with self._lock:
+                    if not self._pending:
+                        self._thread = None
+                        return
+                    items = list(self._pending.items())
+                self._poll_once(items)
+        except BaseException as e:
+            # 迴圈意外結束：讓所有等待中的呼叫端收到例外，而不是永遠阻塞
+            _log.error("❌ 預測輪詢執行緒發生錯誤: %s", e, exc_info=True)
+            with self._lock:
+                failed = list(self._pending.items())
+                self._pending.clear()
+                self._thread = None
+            for _, (_, future) in failed:
+                if not future.done():
+                    future.set_exception(e)
+            raise
+    
+    def _reload(self, item):
+        prediction_id, (prediction, future) = item
+        try:
+            prediction.reload()
+        except Exception as e:
+            self._finish(prediction_id, future, exc=e)
+            return
+        if prediction.status in _TERMINAL_STATUSES:
+            self._finish(prediction_id, future, result=prediction)
+    
+    def _poll_once(self, items):
+        if len(items) == 1:
+            self._reload(items[0])
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=_POLL_MAX_WORKERS, thread_name_prefix="replicate-poll")
+        list(self._executor.map(self._reload, items))
+    
+    def _finish(self, prediction_id, future, result=None, exc=None):
+        with self._lock:
+            self._pending.pop(prediction_id, None)
+        if future.done():
+            return
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+
+_poller = _PredictionPoller(_POLL_INTERVAL)
+
+
+def _run_prediction(model_name, inputs, timeout=_PREDICTION_TIMEOUT):
+    """
+    建立預測並交由共用輪詢執行緒等待結果（取代 replicate.run 的逐一輪詢）
+    model_name 可為 "owner/name" 或 "owner/name:version"；回傳 prediction.output
+    """
+    name, _, version = model_name.partition(':')
+    if version:
+        prediction = replicate.predictions.create(version=version, input=inputs)
+    else:
+        prediction = replicate.models.predictions.create(model=name, input=inputs)
+    if prediction.status not in _TERMINAL_STATUSES:
+        prediction = _poller.wait(prediction, timeout)
+    if prediction.status != "succeeded":
+        raise RuntimeError(f"預測 {prediction.id} {prediction.status}: {prediction.error}")
+    return prediction.output
+
+
 class ReplicateAPI:
     """
     通用 Replicate API 客戶端，支援多種模型
@@ -63,12 +347,50 @@ class ReplicateAPI:
         
         # Set the API token for the replicate library
         os.environ['REPLICATE_API_TOKEN'] = self.api_token
+        # 上傳快取鍵使用的 token 指紋（不保存 token 本身）
+        self._token_fingerprint = hashlib.sha256(self.api_token.encode('utf-8')).hexdigest()[:16]
         
-        print("✅ Replicate API 初始化成功")
+        # 共用連線池，避免每次下載重新建立 TCP/TLS 連線
+        self._session = requests.Session()
+        # 暫時性錯誤 (429/5xx) 以指數退避重試，避免已付費的模型結果因 CDN 錯誤而遺失
+        retries = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['GET'],
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=retries)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        
+        # 輸出目錄只在初始化或設定變更時建立
+        self._output_dir = None
+        self._get_output_dir()
+        
+        _log.info("✅ Replicate API 初始化成功")
+    
+    def __del__(self):
+        session = getattr(self, '_session', None)
+        if session is not None:
+            session.close()
+    
+    def _get_output_dir(self):
+        """
+        取得輸出目錄；僅在首次使用或 ComfyUI 輸出目錄變更時呼叫 os.makedirs
+        
+        Returns:
+            str: 輸出目錄路徑
+        """
+        output_dir = folder_paths.get_output_directory()
+        if output_dir != self._output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+            self._output_dir = output_dir
+        return output_dir
     
     def upload_file(self, file_path):
         """
-        上傳檔案到 Replicate 託管服務
+        上傳檔案到 Replicate 託管服務（429/5xx 與連線錯誤時以指數退避重試）
         
         Args:
             file_path (str): 要上傳的檔案路徑
@@ -76,35 +398,128 @@ class ReplicateAPI:
         Returns:
             str: 上傳檔案的公開 URL
         """
+        _log.info("📤 上傳檔案: %s", file_path)
         try:
-            print(f"📤 上傳檔案: {file_path}")
-            
-            # Use Replicate's file upload
-            with open(file_path, 'rb') as file:
-                uploaded_file = replicate.files.create(file)
-            
-            # Get the URL - uploaded_file.urls is a dict with a 'get' key
-            if hasattr(uploaded_file, 'urls'):
-                # urls is a dict, access the 'get' key
-                if isinstance(uploaded_file.urls, dict):
-                    file_url = uploaded_file.urls.get('get') or uploaded_file.urls.get('url')
-                else:
-                    file_url = str(uploaded_file.urls)
-            elif hasattr(uploaded_file, 'url'):
-                file_url = uploaded_file.url
-            else:
-                # Fallback: convert to string
-                file_url = str(uploaded_file)
-            
-            print(f"✅ 檔案上傳成功: {file_url}")
-            return file_url
-            
-        except Exception as e:
-            print(f"❌ 上傳檔案時發生錯誤: {e}")
-            print(f"   檔案路徑: {file_path}")
-            import traceback
-            traceback.print_exc()
+            # 上傳的檔案屬於特定帳號，快取鍵同時包含 token 指紋
+            cache_key = f"{self._token_fingerprint}:{_hash_file(file_path)}"
+        except OSError as e:
+            _log.error("❌ 上傳檔案時發生錯誤: %s\n   檔案路徑: %s", e, file_path)
             return None
+        cached_url = _upload_cache_get(cache_key)
+        if cached_url:
+            _log.info("♻️ 內容相同，沿用已上傳的 URL: %s", cached_url)
+            return cached_url
+        
+        for attempt in range(1, _UPLOAD_ATTEMPTS + 1):
+            try:
+                uploaded_at = time.time()
+                file_url, expires_at = self._upload_once(file_path)
+                _log.info("✅ 檔案上傳成功: %s", file_url)
+                if file_url:
+                    if expires_at is None:
+                        expires_at = uploaded_at + _UPLOAD_DEFAULT_LIFETIME
+                    _upload_cache_put(cache_key, file_url, expires_at)
+                return file_url
+            except Exception as e:
+                if attempt < _UPLOAD_ATTEMPTS and _is_retryable_upload_error(e):
+                    delay = min(_UPLOAD_BACKOFF_MAX, _UPLOAD_BACKOFF_BASE * (2 ** (attempt - 1)))
+                    _log.warning("⚠️ 上傳失敗 (%s)，%.1f 秒後重試 (%s/%s)", e, delay, attempt, _UPLOAD_ATTEMPTS - 1)
+                    time.sleep(delay)
+                    continue
+                _log.error("❌ 上傳檔案時發生錯誤: %s\n   檔案路徑: %s", e, file_path)
+                _log.debug("upload failed for %s", file_path, exc_info=True)
+                return None
+    
+    def _upload_once(self, file_path):
+        """單次上傳嘗試，回傳 (url, expires_at epoch 秒或 None)；失敗時拋出例外"""
+        # 超過端點上限的檔案一定會被拒絕，先檢查大小以免白白傳送整個檔案
+        size = os.path.getsize(file_path)
+        if size > _UPLOAD_MAX_BYTES:
+            raise ValueError(f"檔案大小 {size} bytes 超過 Replicate 上傳上限 {_UPLOAD_MAX_BYTES} bytes")
+        
+        if HAS_TOOLBELT:
+            return self._stream_upload(file_path)
+        
+        # Use Replicate's file upload
+        with open(file_path, 'rb') as file:
+            uploaded_file = replicate.files.create(file)
+        
+        expires_at = _parse_expires_at(getattr(uploaded_file, 'expires_at', None))
+        
+        # Get the URL - uploaded_file.urls is a dict with a 'get' key
+        if hasattr(uploaded_file, 'urls'):
+            # urls is a dict, access the 'get' key
+            if isinstance(uploaded_file.urls, dict):
+                return uploaded_file.urls.get('get') or uploaded_file.urls.get('url'), expires_at
+            return str(uploaded_file.urls), expires_at
+        if hasattr(uploaded_file, 'url'):
+            return uploaded_file.url, expires_at
+        # Fallback: convert to string
+        return str(uploaded_file), expires_at
+    
+    @staticmethod
+    def content_hash(data):
+        """計算記憶體中資料（bytes、連續 ndarray 等 buffer）的雜湊，格式與 _hash_file 相同"""
+        if HAS_BLAKE3:
+            return "blake3:" + blake3.blake3(data, max_threads=blake3.blake3.AUTO).hexdigest()
+        return "sha256:" + hashlib.sha256(data).hexdigest()
+    
+    def get_cached_upload(self, content_key):
+        """以呼叫端自訂的內容鍵查詢尚未過期的已上傳 URL，找不到時回傳 None"""
+        return _upload_cache_get(f"{self._token_fingerprint}:{content_key}")
+    
+    def cache_upload(self, content_key, url):
+        """記錄內容鍵對應的已上傳 URL，之後相同內容可略過存檔與上傳（到期時間與該 URL 的上傳紀錄相同）"""
+        with _upload_cache_lock:
+            expires_at = _url_expires_at.get(url)
+        if expires_at is None:
+            expires_at = time.time() + _UPLOAD_DEFAULT_LIFETIME
+        _upload_cache_put(f"{self._token_fingerprint}:{content_key}", url, expires_at)
+    
+    def upload_files_concurrently(self, file_paths):
+        """
+        同時上傳多個檔案（上傳為網路 I/O 密集，使用執行緒池並共用連線池）
+        
+        Args:
+            file_paths (list): 要上傳的檔案路徑列表
+        
+        Returns:
+            list: 與 file_paths 順序相同的 URL（失敗者為 None）
+        """
+        if len(file_paths) <= 1:
+            return [self.upload_file(path) for path in file_paths]
+        
+        with ThreadPoolExecutor(max_workers=min(len(file_paths), 4)) as executor:
+            return list(executor.map(self.upload_file, file_paths))
+    
+    def _stream_upload(self, file_path):
+        """
+        以串流 multipart POST 上傳檔案，邊讀取磁碟邊送出，不將整個檔案載入記憶體
+        
+        Args:
+            file_path (str): 要上傳的檔案路徑
+        
+        Returns:
+            tuple: (上傳檔案的公開 URL, expires_at epoch 秒或 None)
+        """
+        content_type = mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+        with open(file_path, 'rb') as file:
+            encoder = MultipartEncoder(fields={
+                'content': (os.path.basename(file_path), file, content_type),
+            })
+            response = self._session.post(
+                _FILES_ENDPOINT,
+                data=encoder,
+                headers={
+                    'Authorization': f'Bearer {self.api_token}',
+                    'Content-Type': encoder.content_type,
+                },
+                timeout=(10, 300),
+            )
+        response.raise_for_status()
+        body = response.json()
+        urls = body.get('urls') or {}
+        return urls.get('get') or urls.get('url'), _parse_expires_at(body.get('expires_at'))
     
     def run_model(self, model_id, inputs, output_filename="replicate_output"):
         """
@@ -119,32 +534,30 @@ class ReplicateAPI:
             Union[str, list]: 輸出檔案路徑或路徑列表
         """
         # Get model configuration
-        config = None
-        if HAS_MODEL_CONFIGS:
-            config = get_model_config(model_id)
+        config = _get_cfg(model_id)
         
         if config:
-            model_name = config["name"]
-            print(f"🤖 執行模型: {model_name}")
+            model_name = config.name
+            _log.info("🤖 執行模型: %s", model_name)
         else:
             # Fallback for models not in config
             model_name = model_id if '/' in model_id else f"replicate/{model_id}"
-            print(f"🤖 執行模型: {model_name}")
+            _log.info("🤖 執行模型: %s", model_name)
         
-        print(f"📝 輸入: {inputs}")
+        _log.debug("📝 輸入: %s", inputs)
         
         try:
             # Run the model on Replicate
-            print(f"📡 傳送請求到 Replicate...")
+            _log.info("📡 傳送請求到 Replicate...")
             
-            output = replicate.run(model_name, input=inputs)
+            output = _run_prediction(model_name, inputs)
             
-            print(f"✅ 模型執行完成")
+            _log.info("✅ 模型執行完成")
             
             # Handle different output types
             if config:
-                outputs = config.get("outputs", ["video"])
-                has_audio = config.get("has_audio", False)
+                outputs = config.outputs
+                has_audio = config.has_audio
                 
                 if len(outputs) == 1 and not has_audio:
                     # Single output
@@ -153,12 +566,12 @@ class ReplicateAPI:
                     # Multiple outputs
                     results = []
                     if isinstance(output, (list, tuple)):
-                        for i, output_type in enumerate(outputs):
-                            if i < len(output):
-                                result = self._process_output(output[i], output_type, f"{output_filename}_{output_type}")
-                                results.append(result)
-                            else:
-                                results.append(None)
+                        jobs = [
+                            (output[i], output_type, f"{output_filename}_{output_type}")
+                            for i, output_type in enumerate(outputs) if i < len(output)
+                        ]
+                        results = self._process_outputs_concurrently(jobs)
+                        results.extend([None] * (len(outputs) - len(results)))
                     else:
                         # Single output but model has audio
                         video_path = self._process_output(output, outputs[0], output_filename)
@@ -176,11 +589,26 @@ class ReplicateAPI:
             return self._process_output(output, "video", output_filename)
                 
         except Exception as e:
-            print(f"❌ 模型執行時發生錯誤: {e}")
-            import traceback
-            traceback.print_exc()
+            _log.error("❌ 模型執行時發生錯誤: %s", e)
+            _log.debug("model run failed for %s", model_name, exc_info=True)
             return None
     
+    def _process_outputs_concurrently(self, jobs):
+        """
+        同時處理多個輸出（下載為 I/O 密集，使用執行緒池並共用連線池）
+        
+        Args:
+            jobs (list): (output, output_type, filename) 組成的列表
+        
+        Returns:
+            list: 與 jobs 順序相同的處理結果
+        """
+        if len(jobs) <= 1:
+            return [self._process_output(*job) for job in jobs]
+        
+        with ThreadPoolExecutor(max_workers=min(len(jobs), 8)) as executor:
+            return list(executor.map(lambda job: self._process_output(*job), jobs))
+    
     def _process_output(self, output, output_type, filename):
         """
         根據類型處理模型輸出
@@ -200,7 +628,6 @@ class ReplicateAPI:
             if hasattr(output, '__dict__'):
                 return vars(output)
             try:
-                import json
                 return json.loads(str(output))
             except Exception:
                 return {"result": str(output)}
@@ -213,10 +640,10 @@ class ReplicateAPI:
         elif isinstance(output, list) and len(output) > 0:
             return self._process_output(output[0], output_type, filename)
         else:
-            print(f"⚠️ 非預期的輸出格式: {type(output)}")
+            _log.warning("⚠️ 非預期的輸出格式: %s", type(output))
             url = str(output)
         
-        print(f"📥 輸出 URL: {url}")
+        _log.info("📥 輸出 URL: %s", url)
         
         # Determine file extension
         extension_map = {
@@ -242,36 +669,90 @@ class ReplicateAPI:
         Returns:
             str: 下載的檔案路徑
         """
+        part_path = None
         try:
-            print(f"⬇️ 下載中: {url}")
+            _log.info("⬇️ 下載中: %s", url)
             
             # Get output directory
-            output_dir = folder_paths.get_output_directory()
-            os.makedirs(output_dir, exist_ok=True)
+            output_dir = self._get_output_dir()
             
-            # Create output path with timestamp
-            timestamp = int(time.time())
-            output_path = os.path.join(output_dir, f"{filename}_{timestamp}{extension}")
+            # Create output path with a unique suffix
+            output_path = os.path.join(output_dir, f"{filename}_{next(_name_counter)}{extension}")
+            # 先寫入 .part 暫存檔，完成後再原子改名，避免留下看似完整的部分檔案
+            part_path = output_path + '.part'
             
-            # Download the file
-            response = requests.get(url, stream=True, timeout=300)
-            response.raise_for_status()
+            # Download the file (resume with a Range request if the stream drops)
+            with open(part_path, 'wb') as f:
+                written = 0
+                resumes = 0
+                while True:
+                    headers = {'Range': f'bytes={written}-'} if written else None
+                    response = self._session.get(url, stream=True, timeout=(10, 300), headers=headers)
+                    try:
+                        response.raise_for_status()
+                        if written and (response.status_code != 206 or response.headers.get('Content-Encoding')):
+                            # 伺服器不支援 Range（或內容經過壓縮編碼），從頭重新下載
+                            f.seek(0)
+                            f.truncate()
+                            written = 0
+                        if not written:
+                            self._preallocate(f, response)
+                        # 直接從 raw 串流以 C 層級迴圈複製到檔案
+                        response.raw.decode_content = True
+                        shutil.copyfileobj(response.raw, f, length=_DOWNLOAD_CHUNK_SIZE)
+                        # 預先配置的大小若與實際不符，截斷至實際寫入長度
+                        f.truncate()
+                        break
+                    except (requests.exceptions.ConnectionError,
+                            urllib3.exceptions.ProtocolError,
+                            urllib3.exceptions.ReadTimeoutError):
+                        written = f.tell()
+                        resumes += 1
+                        if resumes > _DOWNLOAD_MAX_RESUMES:
+                            raise
+                        _log.warning("⚠️ 下載中斷，從 %s bytes 續傳 (%s/%s)", written, resumes, _DOWNLOAD_MAX_RESUMES)
+                    finally:
+                        response.close()
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(part_path, output_path)
             
-            # Save to file
-            with open(output_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-            
-            print(f"✅ 檔案下載成功: {output_path}")
+            _log.info("✅ 檔案下載成功: %s", output_path)
             return output_path
             
         except Exception as e:
-            print(f"❌ 下載檔案時發生錯誤: {e}")
-            import traceback
-            traceback.print_exc()
+            _log.error("❌ 下載檔案時發生錯誤: %s", e)
+            _log.debug("download failed for %s", url, exc_info=True)
+            if part_path:
+                try:
+                    os.unlink(part_path)
+                except OSError:
+                    pass
             return None
     
+    @staticmethod
+    def _preallocate(f, response):
+        """
+        已知 Content-Length 時以 posix_fallocate 預先配置檔案空間，減少磁碟碎片
+        （僅支援的平台且內容未經壓縮編碼時）
+        
+        Args:
+            f: 已開啟的輸出檔案
+            response: requests 回應物件
+        """
+        if not hasattr(os, 'posix_fallocate') or response.headers.get('Content-Encoding'):
+            return
+        try:
+            size = int(response.headers.get('Content-Length', 0))
+        except ValueError:
+            return
+        if size > 0:
+            try:
+                os.posix_fallocate(f.fileno(), 0, size)
+            except OSError:
+                # 檔案系統不支援時直接略過
+                pass
+    
     def _extract_audio_from_video(self, video_path, output_filename):
         """
         從影片檔案提取音訊
@@ -284,38 +765,37 @@ class ReplicateAPI:
             str: 提取的音訊檔案路徑
         """
         try:
-            import subprocess
-            
-            output_dir = folder_paths.get_output_directory()
-            os.makedirs(output_dir, exist_ok=True)
+            output_dir = self._get_output_dir()
             
-            timestamp = int(time.time())
-            audio_path = os.path.join(output_dir, f"{output_filename}_{timestamp}.wav")
+            audio_path = os.path.join(output_dir, f"{output_filename}_{next(_name_counter)}.wav")
             
             # Use ffmpeg to extract audio
+            # 保留來源取樣率與聲道數，避免額外的重新取樣；輸出仍為 WAV 以便 soundfile 讀取
             cmd = [
                 'ffmpeg',
+                '-nostdin',
+                '-loglevel', 'error',
+                '-threads', '0',
                 '-i', video_path,
                 '-vn',  # No video
                 '-acodec', 'pcm_s16le',  # WAV format
-                '-ar', '44100',  # Sample rate
-                '-ac', '2',  # Stereo
                 '-y',  # Overwrite
                 audio_path
             ]
             
-            print(f"🎵 從影片提取音訊...")
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            _log.info("🎵 從影片提取音訊...")
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                    text=True, timeout=60)
             
             if result.returncode == 0 and os.path.exists(audio_path):
-                print(f"✅ 音訊提取完成: {audio_path}")
+                _log.info("✅ 音訊提取完成: %s", audio_path)
                 return audio_path
             else:
-                print(f"⚠️ 無法提取音訊: {result.stderr}")
+                _log.warning("⚠️ 無法提取音訊: %s", result.stderr)
                 return None
                 
         except Exception as e:
-            print(f"⚠️ 提取音訊時發生錯誤: {e}")
+            _log.warning("⚠️ 提取音訊時發生錯誤: %s", e)
             return None
     
     def get_available_models(self):
@@ -341,34 +821,44 @@ class SyncAPI(ReplicateAPI):
         使用 Replicate API 生成嘴唇同步影片
         舊版方法，保持向後相容
         """
-        print(f"🎬 開始生成 lipsync...")
-        print(f"🤖 模型: sync/{model}")
-        
-        # Handle local file uploads
-        if video_path and not video_url:
-            print(f"📹 上傳影片: {video_path}")
-            video_url = self.upload_file(video_path)
-            if not video_url:
-                print(f"❌ 影片上傳失敗")
-                return None
+        _log.info("🎬 開始生成 lipsync...")
+        _log.info("🤖 模型: sync/%s", model)
         
-        if audio_path and not audio_url:
-            print(f"🎵 上傳音訊: {audio_path}")
-            audio_url = self.upload_file(audio_path)
-            if not audio_url:
-                print(f"❌ 音訊上傳失敗")
-                return None
+        # Handle local file uploads (影片與音訊互不相依，同時上傳)
+        upload_video = bool(video_path and not video_url)
+        upload_audio = bool(audio_path and not audio_url)
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            video_future = audio_future = None
+            if upload_video:
+                _log.info("📹 上傳影片: %s", video_path)
+                video_future = executor.submit(self.upload_file, video_path)
+            if upload_audio:
+                _log.info("🎵 上傳音訊: %s", audio_path)
+                audio_future = executor.submit(self.upload_file, audio_path)
+            if video_future:
+                video_url = video_future.result()
+            if audio_future:
+                audio_url = audio_future.result()
+        
+        if upload_video and not video_url:
+            _log.error("❌ 影片上傳失敗")
+            return None
+        
+        if upload_audio and not audio_url:
+            _log.error("❌ 音訊上傳失敗")
+            return None
         
         # Validate inputs
         if not video_url or not audio_url:
-            print(f"❌ 需要同時提供影片和音訊 URL")
+            _log.error("❌ 需要同時提供影片和音訊 URL")
             return None
         
-        print(f"📹 影片 URL: {video_url}")
-        print(f"🎵 音訊 URL: {audio_url}")
-        print(f"⚙️  同步模式: {sync_mode}")
-        print(f"⚙️  溫度: {temperature}")
-        print(f"⚙️  啟用發言者偵測: {active_speaker}")
+        _log.info("📹 影片 URL: %s", video_url)
+        _log.info("🎵 音訊 URL: %s", audio_url)
+        _log.info("⚙️  同步模式: %s", sync_mode)
+        _log.info("⚙️  溫度: %s", temperature)
+        _log.info("⚙️  啟用發言者偵測: %s", active_speaker)
         
         # Prepare inputs
         inputs = {
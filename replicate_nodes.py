@@ -3,13 +3,34 @@ Replicate ComfyUI 節點整合
 支援 Lipsync、通用模型、動態參數等功能
 """
 
+import functools
+import itertools
+import json
+import logging
 import os
+import pathlib
 import shutil
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
 import torch
 import numpy as np
-import cv2
 from .replicate_api import SyncAPI, ReplicateAPI
-from .replicate_utils import VideoUtils, AudioUtils, ImageUtils, cleanup_temp_file
+from .replicate_utils import VideoUtils, AudioUtils, ImageUtils, cleanup_temp_files, host_image, released
+
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+
+# 選用：PyAV 可在行程內解碼影片幀，省去啟動 ffmpeg 子行程
+try:
+    import av
+    HAS_PYAV = True
+except ImportError:
+    HAS_PYAV = False
 
 # 嘗試載入 model_configs
 try:
@@ -22,6 +43,20 @@ except ImportError:
     def get_model_names_by_group(group):  # noqa: unused parameter for fallback
         return []
 
+# 模型清單與配置於匯入時計算/快取，INPUT_TYPES 與每次執行都不再重新走訪模型表
+# (ModelConfig 為 frozen dataclass，快取的物件無法被修改)
+if HAS_MODEL_CONFIGS:
+    _MODEL_NAMES = tuple(get_model_names())
+    _get_config = functools.lru_cache(maxsize=None)(get_model_config)
+else:
+    _MODEL_NAMES = ("lipsync-2-pro",)
+    def _get_config(model_id):  # noqa: unused parameter for fallback
+        return None
+_DEFAULT_MODEL = "sora-2" if "sora-2" in _MODEL_NAMES else _MODEL_NAMES[0]
+
+# 失敗/無預覽時回傳的共用黑色畫面；所有呼叫共用同一張量，請勿原地修改
+_EMPTY_FRAME = torch.zeros((1, 512, 512, 3))
+
 # Try to import ComfyUI's folder_paths
 try:
     import folder_paths
@@ -32,38 +67,145 @@ except ImportError:
             return os.path.join(os.getcwd(), "output")
     folder_paths = FolderPaths()
 
+# 合併輸出檔名尾碼：以載入時間為起點遞增，同一秒內多次合併也不會互相覆寫
+_merge_counter = itertools.count(int(time.time()))
+_output_dir_created = None
+
+
+def _get_output_dir():
+    """取得 ComfyUI 輸出目錄；僅在首次使用或目錄變更時呼叫 os.makedirs"""
+    global _output_dir_created
+    output_dir = folder_paths.get_output_directory()
+    if output_dir != _output_dir_created:
+        os.makedirs(output_dir, exist_ok=True)
+        _output_dir_created = output_dir
+    return output_dir
+
+
+# ffprobe 逾時（秒）；逾時視為無法判斷，改為重新編碼
+_FFPROBE_TIMEOUT = 10
+
+# 副檔名即可確定音訊編碼時不啟動 ffprobe（容器可能含多種編碼的副檔名，例如 .mp4/.m4a，仍需 probe）
+_AUDIO_CODEC_BY_SUFFIX = {
+    '.aac': 'aac',
+    '.wav': 'pcm',
+    '.flac': 'flac',
+    '.mp3': 'mp3',
+    '.ogg': 'vorbis',
+    '.opus': 'opus',
+}
+
+
+@functools.lru_cache(maxsize=64)
+def _probe_audio_codec_cached(path, mtime_ns, size):
+    """以 ffprobe 取得第一條音軌的編碼名稱；mtime/size 作為快取鍵的一部分，檔案變更後會重新 probe"""
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'a:0',
+        '-show_entries', 'stream=codec_name',
+        '-of', 'csv=p=0',
+        path,
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=_FFPROBE_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        _log.warning("⚠️ ffprobe 逾時 (%ss)，改為重新編碼音訊: %s", _FFPROBE_TIMEOUT, path)
+        return ""
+    except OSError:
+        return ""
+    return result.stdout.strip() if result.returncode == 0 else ""
+
+
+def _probe_audio_codec(path, st, by_suffix=True):
+    """
+    取得第一條音軌的編碼名稱；沒有音軌、ffprobe 不可用或逾時時回傳空字串
+    st 為呼叫端已取得的 os.stat 結果；by_suffix 為 True 時可由副檔名直接判斷
+    """
+    if by_suffix:
+        codec = _AUDIO_CODEC_BY_SUFFIX.get(os.path.splitext(path)[1].lower())
+        if codec:
+            return codec
+    return _probe_audio_codec_cached(path, st.st_mtime_ns, st.st_size)
+
+
+def _stat_or_none(path):
+    """os.stat 的 EAFP 版本：路徑不存在或無法存取時回傳 None"""
+    try:
+        return os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+
+
+def _link_or_copy(src, dst):
+    """
+    同一檔案系統時建立硬連結（不複製內容），否則退回 shutil.copy2
+    （Linux 上 shutil.copy2 已使用 sendfile 在核心內複製）
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        # 跨裝置、目標已存在或檔案系統不支援硬連結
+        shutil.copy2(src, dst)
+
+
+# 每次呼叫的診斷訊息為 DEBUG 等級；設定 REPLICATE_DEBUG=1 可開啟
+_log = logging.getLogger("comfyui.replicate.nodes")
+if os.environ.get("REPLICATE_DEBUG") == "1":
+    _log.setLevel(logging.DEBUG)
+
+_SEPARATOR = "=" * 60
+
+# 影片節點的首幀圖片只會被模型重新解碼：以高品質 JPEG 上傳，編碼比 PNG 快得多
+_FIRST_FRAME_JPEG_QUALITY = 92
+
+# 共用 API 客戶端，保留連線池並避免每次執行節點都重新初始化
+_api_singleton = None
+_api_token_key = None
+_api_lock = threading.Lock()
+
+
+def _get_api():
+    """取得所有節點共用的 API 實例（單一 requests.Session 連線池）；REPLICATE_API_TOKEN 變更時重新建立"""
+    global _api_singleton, _api_token_key
+    token_key = hash(os.getenv('REPLICATE_API_TOKEN'))
+    with _api_lock:
+        if _api_singleton is None or _api_token_key != token_key:
+            _api_singleton = SyncAPI()
+            _api_token_key = token_key
+        return _api_singleton
+
 
 class VideoWrapper:
     """影片包裝類別，相容於 Save Video 節點"""
     
     def __init__(self, video_path):
         self.video_path = video_path
-        self._width = None
-        self._height = None
-        self._fps = None
-        self._frame_count = None
-        
-        # Load video properties
-        if os.path.exists(video_path):
-            cap = cv2.VideoCapture(video_path)
-            if cap.isOpened():
-                self._width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                self._height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                self._fps = cap.get(cv2.CAP_PROP_FPS)
-                self._frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-                cap.release()
+    
+    @functools.cached_property
+    def _probe(self):
+        """第一次需要影片屬性時才開啟檔案讀取，之後使用快取"""
+        props = {"width": None, "height": None, "fps": None, "frame_count": None}
+        if os.path.exists(self.video_path):
+            import cv2  # 延遲載入 OpenCV，只有實際需要時才付出載入成本
+            with released(cv2.VideoCapture(self.video_path)) as cap:
+                if cap.isOpened():
+                    props["width"] = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+                    props["height"] = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+                    props["fps"] = cap.get(cv2.CAP_PROP_FPS)
+                    props["frame_count"] = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        return props
     
     def get_dimensions(self):
         """回傳影片尺寸 (width, height)"""
-        return (self._width or 1280, self._height or 720)
+        return (self._probe["width"] or 1280, self._probe["height"] or 720)
     
     def get_fps(self):
         """回傳影片幀率"""
-        return self._fps or 30.0
+        return self._probe["fps"] or 30.0
     
     def get_frame_count(self):
         """回傳總幀數"""
-        return self._frame_count or 0
+        return self._probe["frame_count"] or 0
     
     def get_path(self):
         """回傳影片檔案路徑"""
@@ -76,15 +218,15 @@ class VideoWrapper:
                 os.makedirs(os.path.dirname(output_path), exist_ok=True)
                 format_type = kwargs.get('format', None)
                 if format_type:
-                    print(f"📁 儲存影片格式: {format_type}")
-                shutil.copy2(self.video_path, output_path)
-                print(f"✅ 影片已儲存至: {output_path}")
+                    _log.info("📁 儲存影片格式: %s", format_type)
+                _link_or_copy(self.video_path, output_path)
+                _log.info("✅ 影片已儲存至: %s", output_path)
                 return output_path
             else:
-                print(f"❌ 來源影片不存在: {self.video_path}")
+                _log.error("❌ 來源影片不存在: %s", self.video_path)
                 return None
         except Exception as e:
-            print(f"❌ 儲存影片時發生錯誤: {e}")
+            _log.error("❌ 儲存影片時發生錯誤: %s", e)
             return None
         
     def __str__(self):
@@ -123,35 +265,31 @@ class SyncLipsyncNode:
     def generate_lipsync(self, video, audio, output_filename="lipsync_output", 
                         sync_mode="loop", temperature=0.5, active_speaker=False):
         """生成嘴唇同步影片"""
-        print("=" * 60)
-        print("🎬 Replicate Lipsync 生成 (sync/lipsync-2-pro)")
-        print("=" * 60)
+        _log.info("%s\n🎬 Replicate Lipsync 生成 (sync/lipsync-2-pro)\n%s", _SEPARATOR, _SEPARATOR)
         
         temp_files = []
         
         try:
-            api = SyncAPI()
+            api = _get_api()
             
-            print("🎞️ 處理影片輸入...")
+            _log.info("🎞️ 處理影片輸入...")
             fps = 24
             final_video_path = VideoUtils.save_image_sequence_to_video(video, fps=fps)
             if final_video_path:
                 temp_files.append(final_video_path)
             else:
-                print("❌ 處理影片輸入失敗！")
+                _log.error("❌ 處理影片輸入失敗！")
                 return ([], [])
             
-            print("🎵 處理音訊輸入...")
+            _log.info("🎵 處理音訊輸入...")
             final_audio_path = AudioUtils.save_audio_from_comfyui(audio)
             if final_audio_path:
                 temp_files.append(final_audio_path)
             else:
-                print("❌ 處理音訊輸入失敗！")
+                _log.error("❌ 處理音訊輸入失敗！")
                 return ([], [])
             
-            print("=" * 60)
-            print("📤 上傳檔案到 Replicate...")
-            print("=" * 60)
+            _log.info("%s\n📤 上傳檔案到 Replicate...\n%s", _SEPARATOR, _SEPARATOR)
             
             result_video_path = api.generate_lipsync(
                 video_path=final_video_path,
@@ -163,42 +301,31 @@ class SyncLipsyncNode:
                 active_speaker=active_speaker
             )
             
-            for temp_file in temp_files:
-                cleanup_temp_file(temp_file)
+            cleanup_temp_files(temp_files)
             
             if result_video_path and os.path.exists(result_video_path):
-                print("=" * 60)
-                print("✅ Lipsync 生成完成！")
-                print(f"📁 輸出: {result_video_path}")
-                print("=" * 60)
+                _log.info("%s\n✅ Lipsync 生成完成！\n📁 輸出: %s\n%s", _SEPARATOR, result_video_path, _SEPARATOR)
                 
                 video_paths = [result_video_path]
                 audio_paths = [final_audio_path] if final_audio_path and os.path.exists(final_audio_path) else []
                 
                 return (video_paths, audio_paths)
             else:
-                print("=" * 60)
-                print("❌ Lipsync 生成失敗！")
-                print("=" * 60)
+                _log.error("%s\n❌ Lipsync 生成失敗！\n%s", _SEPARATOR, _SEPARATOR)
                 return ([], [])
                 
         except ValueError as e:
-            print(f"❌ API 初始化失敗: {str(e)}")
-            print("\n請確保：")
-            print("1. 在 .env 檔案中設定 REPLICATE_API_TOKEN")
-            print("2. 從以下網址取得 API token: https://replicate.com/account/api-tokens")
+            _log.error("❌ API 初始化失敗: %s\n\n請確保：\n"
+                       "1. 在 .env 檔案中設定 REPLICATE_API_TOKEN\n"
+                       "2. 從以下網址取得 API token: https://replicate.com/account/api-tokens", e)
             
-            for temp_file in temp_files:
-                cleanup_temp_file(temp_file)
+            cleanup_temp_files(temp_files)
             
             return ([], [])
         except Exception as e:
-            print(f"❌ 生成時發生錯誤: {e}")
-            import traceback
-            traceback.print_exc()
+            _log.error("❌ 生成時發生錯誤: %s", e, exc_info=True)
             
-            for temp_file in temp_files:
-                cleanup_temp_file(temp_file)
+            cleanup_temp_files(temp_files)
             
             return ([], [])
 
@@ -225,29 +352,31 @@ class SyncVideoOutput:
     
     def output_video(self, video_paths, audio_paths=None):
         if not video_paths:
-            print("⚠️ 警告：沒有生成影片。")
+            _log.warning("⚠️ 警告：沒有生成影片。")
             return (None,)
         
         video_path = video_paths[0] if isinstance(video_paths, list) else video_paths
         
         if not os.path.exists(video_path):
-            print(f"⚠️ 警告：找不到影片檔案: {video_path}")
+            _log.warning("⚠️ 警告：找不到影片檔案: %s", video_path)
             return (None,)
         
-        print(f"✅ 影片檔案就緒: {video_path}")
+        _log.info("✅ 影片檔案就緒: %s", video_path)
         
         if audio_paths and len(audio_paths) > 0:
             try:
                 audio_path = audio_paths[0]
                 if os.path.exists(audio_path):
-                    print(f"✅ 音訊檔案可用: {audio_path}")
+                    _log.info("✅ 音訊檔案可用: %s", audio_path)
                 else:
-                    print(f"⚠️ 找不到音訊檔案: {audio_path}")
+                    _log.warning("⚠️ 找不到音訊檔案: %s", audio_path)
             except Exception as e:
-                print(f"⚠️ 處理音訊失敗: {e}")
+                _log.warning("⚠️ 處理音訊失敗: %s", e)
         
         video_wrapper = VideoWrapper(video_path)
-        print(f"✅ 已建立影片包裝器: {video_wrapper.get_dimensions()}")
+        # 尺寸需開檔探測，只在 DEBUG 時才取得
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug("✅ 已建立影片包裝器: %s", video_wrapper.get_dimensions())
         
         return (video_wrapper,)
 
@@ -267,12 +396,11 @@ class ReplicateDynamicNode:
     
     @classmethod
     def INPUT_TYPES(cls):
-        model_list = get_model_names() if HAS_MODEL_CONFIGS else ["lipsync-2-pro"]
-        
+        # ComfyUI 下拉選單需要 list
         return {
             "required": {
-                "model": (model_list, {
-                    "default": "sora-2" if "sora-2" in model_list else model_list[0],
+                "model": (list(_MODEL_NAMES), {
+                    "default": _DEFAULT_MODEL,
                     "tooltip": "選擇模型 / Select Model - 節點將自動使用該模型需要的參數 / Node will automatically use parameters required by this model"
                 }),
             },
@@ -452,32 +580,34 @@ class ReplicateVideoOutput:
     def output_video(self, video_paths, audio_paths=None):
         """將影片路徑轉換為 VIDEO 格式"""
         if not video_paths:
-            print("⚠️ 警告：沒有生成影片。")
+            _log.warning("⚠️ 警告：沒有生成影片。")
             return (None,)
         
         # 取得第一個影片路徑
         video_path = video_paths[0] if isinstance(video_paths, list) else video_paths
         
         if not os.path.exists(video_path):
-            print(f"⚠️ 警告：找不到影片檔案: {video_path}")
+            _log.warning("⚠️ 警告：找不到影片檔案: %s", video_path)
             return (None,)
         
-        print(f"✅ 影片檔案就緒: {video_path}")
+        _log.info("✅ 影片檔案就緒: %s", video_path)
         
         # 處理音訊資訊（如有提供）
         if audio_paths and len(audio_paths) > 0:
             try:
                 audio_path = audio_paths[0]
                 if os.path.exists(audio_path):
-                    print(f"✅ 音訊檔案可用: {audio_path}")
+                    _log.info("✅ 音訊檔案可用: %s", audio_path)
                 else:
-                    print(f"⚠️ 找不到音訊檔案: {audio_path}")
+                    _log.warning("⚠️ 找不到音訊檔案: %s", audio_path)
             except Exception as e:
-                print(f"⚠️ 處理音訊失敗: {e}")
+                _log.warning("⚠️ 處理音訊失敗: %s", e)
         
         # 建立 VideoWrapper 物件供 Save Video 節點使用
         video_wrapper = VideoWrapper(video_path)
-        print(f"✅ 已建立影片包裝器: {video_wrapper.get_dimensions()}")
+        # 尺寸需開檔探測，只在 DEBUG 時才取得
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug("✅ 已建立影片包裝器: %s", video_wrapper.get_dimensions())
         
         return (video_wrapper,)
 
@@ -503,43 +633,36 @@ class ReplicateAudioOutput:
     def output_audio(self, audio_paths):
         """載入並輸出音訊檔案"""
         if not audio_paths:
-            print("⚠️ 警告：沒有生成音訊。")
+            _log.warning("⚠️ 警告：沒有生成音訊。")
             return (None,)
         
         # 取得第一個音訊路徑
         audio_path = audio_paths[0] if isinstance(audio_paths, list) else audio_paths
         
         if not os.path.exists(audio_path):
-            print(f"⚠️ 警告：找不到音訊檔案: {audio_path}")
+            _log.warning("⚠️ 警告：找不到音訊檔案: %s", audio_path)
             return (None,)
         
         try:
-            import soundfile as sf
-            waveform, sample_rate = sf.read(audio_path)
+            if not SOUNDFILE_AVAILABLE:
+                _log.error("❌ soundfile 未安裝，無法載入音訊")
+                return (None,)
+            # 直接解碼為 float32 並固定 (frames, channels)，避免 float64 中間陣列
+            waveform, sample_rate = sf.read(audio_path, dtype='float32', always_2d=True)
             
-            waveform_tensor = torch.from_numpy(waveform).float()
-            
-            if len(waveform_tensor.shape) == 1:
-                waveform_tensor = waveform_tensor.unsqueeze(0)
-            elif len(waveform_tensor.shape) == 2:
-                if waveform_tensor.shape[0] > waveform_tensor.shape[1]:
-                    waveform_tensor = waveform_tensor.transpose(0, 1)
+            waveform_tensor = torch.from_numpy(waveform).transpose(0, 1).contiguous()
             
             audio_dict = {
                 "waveform": waveform_tensor,
                 "sample_rate": sample_rate
             }
             
-            print(f"✅ 音訊已載入: {audio_path}")
-            print(f"   取樣率: {sample_rate}Hz")
-            print(f"   形狀: {waveform_tensor.shape}")
+            _log.info("✅ 音訊已載入: %s\n   取樣率: %sHz\n   形狀: %s", audio_path, sample_rate, waveform_tensor.shape)
             
             return (audio_dict,)
             
         except Exception as e:
-            print(f"❌ 載入音訊時發生錯誤: {e}")
-            import traceback
-            traceback.print_exc()
+            _log.error("❌ 載入音訊時發生錯誤: %s", e, exc_info=True)
             return (None,)
 
 
@@ -568,62 +691,69 @@ class ReplicateVideoAudioMerge:
     def merge_video_audio(self, video_paths, audio_paths, output_filename="merged_video"):
         """使用 ffmpeg 合併影片和音訊"""
         if not video_paths:
-            print("❌ 沒有提供影片")
+            _log.error("❌ 沒有提供影片")
             return (None,)
         
         # 取得第一個影片和音訊路徑
         video_path = video_paths[0] if isinstance(video_paths, list) else video_paths
         
-        if not os.path.exists(video_path):
-            print(f"❌ 找不到影片檔案: {video_path}")
+        # 每個路徑只 stat 一次，結果同時用於存在檢查與同檔比對
+        video_stat = _stat_or_none(video_path)
+        if video_stat is None:
+            _log.error("❌ 找不到影片檔案: %s", video_path)
             return (None,)
         
         if not audio_paths or len(audio_paths) == 0:
-            print("⚠️ 沒有提供音訊，回傳原始影片")
+            _log.warning("⚠️ 沒有提供音訊，回傳原始影片")
             return (VideoWrapper(video_path),)
         
         audio_path = audio_paths[0] if isinstance(audio_paths, list) else audio_paths
         
-        if not os.path.exists(audio_path):
-            print(f"⚠️ 找不到音訊檔案: {audio_path}，回傳原始影片")
+        audio_stat = _stat_or_none(audio_path)
+        if audio_stat is None:
+            _log.warning("⚠️ 找不到音訊檔案: %s，回傳原始影片", audio_path)
+            return (VideoWrapper(video_path),)
+        
+        # 音訊就是影片本身（影片已含該音軌）時不需重新封裝
+        if os.path.samestat(video_stat, audio_stat) and _probe_audio_codec(video_path, video_stat, by_suffix=False):
+            _log.info("✅ 影片已包含音軌，直接回傳原始影片")
             return (VideoWrapper(video_path),)
         
         try:
-            import subprocess
-            
-            output_dir = folder_paths.get_output_directory()
-            os.makedirs(output_dir, exist_ok=True)
+            output_path = os.path.join(_get_output_dir(), f"{output_filename}_{next(_merge_counter)}.mp4")
             
-            import time
-            timestamp = int(time.time())
-            output_path = os.path.join(output_dir, f"{output_filename}_{timestamp}.mp4")
+            # 音訊已是 AAC（例如從 mp4/m4a 取得）時直接複製音軌，不重新編碼
+            audio_codec = 'copy' if _probe_audio_codec(audio_path, audio_stat) == 'aac' else 'aac'
             
             cmd = [
                 'ffmpeg',
+                '-nostdin',
                 '-i', video_path,
                 '-i', audio_path,
+                '-map', '0:v:0',
+                '-map', '1:a:0',
                 '-c:v', 'copy',
-                '-c:a', 'aac',
-                '-strict', 'experimental',
+                '-c:a', audio_codec,
                 '-shortest',
+                '-movflags', '+faststart',
                 '-y',
                 output_path
             ]
             
-            print(f"🔄 合併影片和音訊...")
+            _log.info("🔄 合併影片和音訊...")
             result = subprocess.run(cmd, capture_output=True, text=True)
             
             if result.returncode == 0 and os.path.exists(output_path):
-                print(f"✅ 已儲存合併影片: {output_path}")
+                _log.info("✅ 已儲存合併影片: %s", output_path)
                 return (VideoWrapper(output_path),)
             else:
-                print(f"❌ FFmpeg 合併失敗: {result.stderr}")
-                print("⚠️ 回傳原始影片")
+                _log.error("❌ FFmpeg 合併失敗: %s", result.stderr)
+                _log.warning("⚠️ 回傳原始影片")
                 return (VideoWrapper(video_path),)
                 
         except Exception as e:
-            print(f"❌ 合併影片和音訊時發生錯誤: {e}")
-            print("⚠️ 回傳原始影片")
+            _log.error("❌ 合併影片和音訊時發生錯誤: %s", e)
+            _log.warning("⚠️ 回傳原始影片")
             return (VideoWrapper(video_path),)
 
 
@@ -656,14 +786,12 @@ class ReplicateTextToVideoNode:
     def generate_video(self, prompt, model="minimax-video-01", first_frame_image=None, 
                       prompt_optimizer=True, output_filename="text_to_video"):
         """從文字生成影片"""
-        print("=" * 60)
-        print(f"🎬 文字生成影片: {model}")
-        print("=" * 60)
+        _log.info("%s\n🎬 文字生成影片: %s\n%s", _SEPARATOR, model, _SEPARATOR)
         
         temp_files = []
         
         try:
-            api = ReplicateAPI()
+            api = _get_api()
             
             inputs = {
                 "prompt": prompt,
@@ -671,29 +799,24 @@ class ReplicateTextToVideoNode:
             }
             
             if first_frame_image is not None:
-                image_path = ImageUtils.save_image_tensor(first_frame_image)
-                if image_path:
-                    temp_files.append(image_path)
-                    image_url = api.upload_file(image_path)
-                    if image_url:
-                        inputs["first_frame_image"] = image_url
+                image_url = _upload_image_cached(api, first_frame_image, temp_files,
+                                                 jpeg_quality=_FIRST_FRAME_JPEG_QUALITY)
+                if image_url:
+                    inputs["first_frame_image"] = image_url
             
             result_path = api.run_model(model, inputs, output_filename)
             
-            for temp_file in temp_files:
-                cleanup_temp_file(temp_file)
-            
             if result_path:
-                print(f"✅ 影片已生成: {result_path}")
+                _log.info("✅ 影片已生成: %s", result_path)
                 return (result_path,)
             else:
                 return ("",)
                 
         except Exception as e:
-            print(f"❌ 錯誤: {e}")
-            for temp_file in temp_files:
-                cleanup_temp_file(temp_file)
+            _log.error("❌ 錯誤: %s", e)
             return ("",)
+        finally:
+            cleanup_temp_files(temp_files)
 
 
 class ReplicateImageToVideoNode:
@@ -726,24 +849,16 @@ class ReplicateImageToVideoNode:
                       guidance_scale=7.5, num_inference_steps=50, motion_bucket_id=127,
                       fps=6, output_filename="image_to_video"):
         """從圖片生成影片"""
-        print("=" * 60)
-        print(f"🎬 圖片生成影片: {model}")
-        print("=" * 60)
+        _log.info("%s\n🎬 圖片生成影片: %s\n%s", _SEPARATOR, model, _SEPARATOR)
         
         temp_files = []
         
         try:
-            api = ReplicateAPI()
-            
-            image_path = ImageUtils.save_image_tensor(image)
-            if not image_path:
-                print("❌ 儲存圖片失敗")
-                return ("",)
+            api = _get_api()
             
-            temp_files.append(image_path)
-            image_url = api.upload_file(image_path)
+            image_url = _upload_image_cached(api, image, temp_files, jpeg_quality=_FIRST_FRAME_JPEG_QUALITY)
             if not image_url:
-                print("❌ 上傳圖片失敗")
+                _log.error("❌ 儲存或上傳圖片失敗")
                 return ("",)
             
             inputs = {"image": image_url}
@@ -763,22 +878,17 @@ class ReplicateImageToVideoNode:
             
             result_path = api.run_model(model, inputs, output_filename)
             
-            for temp_file in temp_files:
-                cleanup_temp_file(temp_file)
-            
             if result_path:
-                print(f"✅ 影片已生成: {result_path}")
+                _log.info("✅ 影片已生成: %s", result_path)
                 return (result_path,)
             else:
                 return ("",)
                 
         except Exception as e:
-            print(f"❌ 錯誤: {e}")
-            import traceback
-            traceback.print_exc()
-            for temp_file in temp_files:
-                cleanup_temp_file(temp_file)
+            _log.error("❌ 錯誤: %s", e, exc_info=True)
             return ("",)
+        finally:
+            cleanup_temp_files(temp_files)
 
 
 class ReplicateImageGenNode:
@@ -812,12 +922,10 @@ class ReplicateImageGenNode:
                       guidance=3.5, num_inference_steps=28, output_format="webp",
                       output_quality=80, output_filename="generated_image"):
         """從文字生成圖片"""
-        print("=" * 60)
-        print(f"🖼️ 圖片生成: {model}")
-        print("=" * 60)
+        _log.info("%s\n🖼️ 圖片生成: %s\n%s", _SEPARATOR, model, _SEPARATOR)
         
         try:
-            api = ReplicateAPI()
+            api = _get_api()
             
             inputs = {
                 "prompt": prompt,
@@ -835,22 +943,17 @@ class ReplicateImageGenNode:
             result_path = api.run_model(model, inputs, output_filename)
             
             if result_path and os.path.exists(result_path):
-                image = cv2.imread(result_path)
-                if image is not None:
-                    image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-                    image_tensor = torch.from_numpy(image_rgb).float() / 255.0
-                    image_tensor = image_tensor.unsqueeze(0)
-                    print(f"✅ 圖片已載入: {image_tensor.shape}")
+                image_tensor = _load_image_tensor(result_path)
+                if image_tensor is not None:
+                    _log.info("✅ 圖片已載入: %s", image_tensor.shape)
                     return (image_tensor,)
             
-            print("❌ 生成圖片失敗")
-            return (torch.zeros((1, 512, 512, 3)),)
+            _log.error("❌ 生成圖片失敗")
+            return (_EMPTY_FRAME,)
                 
         except Exception as e:
-            print(f"❌ 錯誤: {e}")
-            import traceback
-            traceback.print_exc()
-            return (torch.zeros((1, 512, 512, 3)),)
+            _log.error("❌ 錯誤: %s", e, exc_info=True)
+            return (_EMPTY_FRAME,)
 
 
 class ReplicateModelInfo:
@@ -879,13 +982,10 @@ class ReplicateModelInfo:
     def display_info(self, execution_info=""):
         """顯示執行資訊"""
         if execution_info and execution_info.strip():
-            print("\n" + "=" * 70)
-            print("📊 執行資訊 / Execution Information")
-            print("=" * 70)
-            print(execution_info)
-            print("=" * 70 + "\n")
+            _log.info("%s\n📊 執行資訊 / Execution Information\n%s\n%s\n%s",
+                      _SEPARATOR, _SEPARATOR, execution_info, _SEPARATOR)
         else:
-            print("ℹ️  等待執行資訊... / Waiting for execution info...")
+            _log.info("ℹ️  等待執行資訊... / Waiting for execution info...")
         
         return {}
 
@@ -907,6 +1007,276 @@ def _extract_video_path(video_input):
     return None
 
 
+def _uint8_to_tensor(rgb):
+    """
+    將 uint8 RGB 影像（可為 stride 檢視）轉為 ComfyUI (1, H, W, 3) float32 張量
+    轉型與正規化在同一次 np.multiply 中直接寫入 float32 輸出
+    """
+    out = np.empty(rgb.shape, dtype=np.float32)
+    np.multiply(rgb, np.float32(1.0 / 255.0), out=out)
+    return torch.from_numpy(out).unsqueeze_(0)
+
+
+def _bgr_to_tensor(image):
+    """將 OpenCV 的 BGR uint8 影像轉為張量（反轉通道為 stride 檢視，不另外複製）"""
+    return _uint8_to_tensor(image[:, :, ::-1])
+
+
+def _load_image_tensor(path):
+    """
+    讀取圖片為 (1, H, W, 3) float32 張量：優先以 Pillow 直接解碼為 RGB，
+    未安裝時退回 OpenCV；無法讀取時回傳 None
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        import cv2
+        image = cv2.imread(path)
+        return _bgr_to_tensor(image) if image is not None else None
+    with Image.open(path) as img:
+        # 已是 RGB（JPEG 等常見輸出）時直接讀取解碼結果，省去 convert 複製整張影像
+        rgb = np.asarray(img if img.mode == 'RGB' else img.convert('RGB'))
+    return _uint8_to_tensor(rgb)
+
+
+_MODEL_3D_SUFFIXES = frozenset({'.glb', '.obj', '.fbx', '.gltf'})
+_IMAGE_SUFFIXES = frozenset({'.png', '.jpg', '.jpeg', '.webp', '.bmp'})
+
+
+def _paths_from_sequence(result, config):
+    """[影片, 音訊] 形式的結果 -> (video_path, audio_path, file_path)"""
+    if len(result) < 2:
+        return "", "", ""
+    return result[0] or "", result[1] or "", ""
+
+
+def _paths_from_str(result, config):
+    """單一路徑結果：依副檔名分為 3D 檔案、圖片（稍後載入）或影片"""
+    path = pathlib.Path(result)
+    suffix = path.suffix.lower()
+    if suffix in _MODEL_3D_SUFFIXES:
+        return "", "", result
+    if suffix in _IMAGE_SUFFIXES:
+        return "", "", ""
+    audio_path = ""
+    if config.has_audio:
+        for candidate in (path.with_suffix('.wav'), path.with_name(f"{path.stem}_audio.wav")):
+            if candidate.exists():
+                audio_path = str(candidate)
+                break
+    return result, audio_path, ""
+
+
+# run_model 回傳型別 -> 路徑拆解函式 (dict 結果在呼叫端另行處理)
+_RESULT_HANDLERS = {
+    list: _paths_from_sequence,
+    tuple: _paths_from_sequence,
+    str: _paths_from_str,
+}
+
+
+def _extract_first_frame(video_path):
+    """
+    只解碼影片第一幀：有 PyAV 時在行程內解碼，否則（或失敗、沒有取得畫面時）改用 ffmpeg 管線
+    Returns: (1, H, W, 3) float32 張量，失敗時回傳 None
+    """
+    if HAS_PYAV:
+        try:
+            frame = _extract_first_frame_pyav(video_path)
+            if frame is not None:
+                return frame
+        except Exception:
+            pass
+    return _extract_first_frame_ffmpeg(video_path)
+
+
+def _extract_first_frame_pyav(video_path):
+    """以 PyAV 解碼第一個關鍵幀，不需啟動子行程；沒有標記為關鍵幀的畫面時回傳 None"""
+    with av.open(video_path) as container:
+        stream = container.streams.video[0]
+        stream.codec_context.skip_frame = 'NONKEY'
+        for frame in container.decode(stream):
+            rgb = frame.to_ndarray(format='rgb24')
+            return torch.from_numpy(rgb).to(torch.float32).div_(255.0).unsqueeze_(0)
+    return None
+
+
+def _extract_first_frame_ffmpeg(video_path):
+    """以 ffmpeg 只解碼第一幀（輸出 PPM 到 stdout，標頭內含寬高）"""
+    cmd = [
+        'ffmpeg', '-nostdin', '-loglevel', 'error',
+        '-i', video_path,
+        '-frames:v', '1',
+        '-f', 'image2pipe', '-c:v', 'ppm', '-pix_fmt', 'rgb24',
+        'pipe:1',
+    ]
+    try:
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except OSError:
+        return None
+    # PPM 格式: b"P6\n<寬> <高>\n255\n" + RGB 原始像素
+    parts = result.stdout.split(b'\n', 3)
+    if result.returncode != 0 or len(parts) < 4 or parts[0] != b'P6':
+        return None
+    width, height = map(int, parts[1].split())
+    pixels = np.frombuffer(parts[3], dtype=np.uint8, count=width * height * 3)
+    frame = torch.from_numpy(pixels.reshape(height, width, 3).copy())
+    return frame.float().div_(255.0).unsqueeze(0)
+
+
+def _tensor_cache_key(arr):
+    """
+    以主機端圖片陣列（host_image 的結果，與 save_image_tensor 實際存檔的內容一致）的原始位元組計算上傳快取鍵
+    非陣列時回傳 None
+    """
+    if not hasattr(arr, 'ndim'):
+        return None
+    arr = np.ascontiguousarray(arr)
+    return f"tensor:{arr.dtype.str}:{'x'.join(map(str, arr.shape))}:{ReplicateAPI.content_hash(arr)}"
+
+
+def _save_image_for_upload(api, image, jpeg_quality=None):
+    """
+    圖片只搬到主機端一次，同一份陣列先計算快取鍵、未命中時再存成暫存檔
+    jpeg_quality 有值時存成 JPEG（快取鍵含品質，不會與無損 PNG 的上傳互相沿用）
+    Returns: (cached_url, image_path, key)；命中快取時 image_path 為 None
+    """
+    with host_image(image) as arr:
+        key = _tensor_cache_key(arr)
+        if key and jpeg_quality:
+            key = f"{key}:jpeg{int(jpeg_quality)}"
+        cached_url = api.get_cached_upload(key) if key else None
+        if cached_url:
+            return cached_url, None, key
+        return None, ImageUtils.save_image_tensor(arr, jpeg_quality=jpeg_quality), key
+
+
+def _upload_image_cached(api, image, temp_files, jpeg_quality=None):
+    """上傳圖片張量；相同內容已上傳過時略過編碼與上傳，回傳 URL（失敗時為 None）"""
+    cached_url, image_path, key = _save_image_for_upload(api, image, jpeg_quality)
+    if cached_url:
+        _log.info("♻️ 相同圖片已上傳過，沿用 URL: %s", cached_url)
+        return cached_url
+    if not image_path:
+        return None
+    temp_files.append(image_path)
+    url = api.upload_file(image_path)
+    if url and key:
+        api.cache_upload(key, url)
+    return url
+
+
+@dataclass(slots=True)
+class _InputContext:
+    """_run_replicate_model 輸入處理函式共用的狀態"""
+    model_id: str
+    prompt: str
+    image_map: dict
+    video: object
+    audio: object
+    kwargs: dict
+    inputs: dict
+    temp_files: list
+    api: object = None
+    upload_jobs: list = field(default_factory=list)   # (input_name, local_path)
+    list_jobs: dict = field(default_factory=dict)     # input_name -> [local_path, ...]
+    upload_keys: dict = field(default_factory=dict)   # local_path -> 張量內容鍵
+
+    def image_param(self, input_name):
+        if input_name in self.image_map:
+            return self.image_map[input_name]
+        return self.kwargs.get(input_name)
+
+
+def _h_string(input_name, input_config, ctx):
+    # 目前只有 prompt 由節點的文字欄位提供
+    if input_name == "prompt" and (ctx.prompt or input_config.get("required", False)):
+        ctx.inputs[input_name] = ctx.prompt
+
+
+def _h_image(input_name, input_config, ctx):
+    image_param = ctx.image_param(input_name)
+    if image_param is not None:
+        # 相同張量已上傳過時直接沿用 URL，不需編碼 PNG 也不需上傳
+        cached_url, image_path, key = _save_image_for_upload(ctx.api, image_param)
+        if cached_url:
+            ctx.inputs[input_name] = cached_url
+            return
+        if image_path:
+            ctx.temp_files.append(image_path)
+            ctx.upload_jobs.append((input_name, image_path))
+            if key:
+                ctx.upload_keys[image_path] = key
+    elif input_config.get("required", False):
+        _log.warning("⚠️ 必要圖片參數 '%s' 未提供", input_name)
+
+
+def _h_image_list(input_name, input_config, ctx):
+    image_param = ctx.image_param(input_name)
+    if image_param is None:
+        if input_config.get("required", False):
+            _log.warning("⚠️ 必要圖片清單 '%s' 未提供", input_name)
+        return
+    # 將批次圖片張量逐張存檔
+    arr = image_param.cpu().numpy() if isinstance(image_param, torch.Tensor) else image_param
+    if not hasattr(arr, 'shape'):
+        return
+    if len(arr.shape) == 3:
+        arr = arr[None, ...]
+    paths = []
+    for i in range(arr.shape[0]):
+        path = ImageUtils.save_image_tensor(arr[i:i+1])
+        if not path:
+            continue
+        ctx.temp_files.append(path)
+        paths.append(path)
+    if paths:
+        ctx.list_jobs[input_name] = paths
+
+
+def _h_video(input_name, input_config, ctx):
+    if ctx.video is not None:
+        video_path = _extract_video_path(ctx.video)
+        if video_path and os.path.exists(video_path):
+            ctx.upload_jobs.append((input_name, video_path))
+
+
+def _h_audio(input_name, input_config, ctx):
+    if ctx.audio is not None:
+        audio_path = AudioUtils.save_audio_from_comfyui(ctx.audio)
+        if audio_path:
+            ctx.temp_files.append(audio_path)
+            ctx.upload_jobs.append((input_name, audio_path))
+
+
+def _h_scalar(input_name, input_config, ctx):
+    value = ctx.kwargs.get(input_name)
+    if input_config.get("type") == "COMBO":
+        allowed = input_config.get("options", [])
+        if value is not None and allowed and value not in allowed:
+            fallback = input_config.get("default", allowed[0])
+            _log.warning("⚠️ '%s'='%s' 不被 %s 支援，改用 '%s' (允許值: %s)", input_name, value, ctx.model_id, fallback, allowed)
+            value = fallback
+    if value is not None:
+        ctx.inputs[input_name] = value
+    elif input_config.get("required", False) and "default" in input_config:
+        ctx.inputs[input_name] = input_config["default"]
+
+
+# 模型輸入型別 -> 處理函式；未列出的型別會被略過
+_INPUT_HANDLERS = {
+    "STRING": _h_string,
+    "IMAGE": _h_image,
+    "IMAGE_LIST": _h_image_list,
+    "VIDEO": _h_video,
+    "AUDIO": _h_audio,
+    "COMBO": _h_scalar,
+    "FLOAT": _h_scalar,
+    "INT": _h_scalar,
+    "BOOLEAN": _h_scalar,
+}
+
+
 def _run_replicate_model(model_id, prompt="", image=None, input_reference=None,
                           first_frame_image=None, last_frame=None, start_image=None,
                           video=None, audio=None, **kwargs):
@@ -914,129 +1284,64 @@ def _run_replicate_model(model_id, prompt="", image=None, input_reference=None,
     共用的 Replicate 模型執行邏輯
     Returns: (video_paths, audio_paths, first_frame_tensor, info_text, file_path)
     """
-    config = get_model_config(model_id) if HAS_MODEL_CONFIGS else None
+    config = _get_config(model_id)
     if not config:
         info = f"❌ 未知模型: {model_id}"
-        print(info)
-        return ([], [], torch.zeros((1, 512, 512, 3)), info, "")
+        _log.error("%s", info)
+        return ([], [], _EMPTY_FRAME, info, "")
     
-    print("=" * 60)
-    print(f"🤖 Replicate: {config['display_name']}")
-    print(f"📋 模型ID: {model_id}")
-    print("=" * 60)
+    _log.info("%s\n🤖 Replicate: %s\n📋 模型ID: %s\n%s", _SEPARATOR, config.display_name, model_id, _SEPARATOR)
     
     output_filename = model_id.replace(".", "_").replace("/", "_")
     temp_files = []
     
     try:
-        api = ReplicateAPI()
+        api = _get_api()
         inputs = {}
-        model_inputs = config.get("inputs", {})
-        
-        # 圖片參數對照表
-        image_map = {
-            'image': image,
-            'input_reference': input_reference,
-            'first_frame_image': first_frame_image,
-            'last_frame': last_frame,
-            'start_image': start_image,
-        }
-
-        def _upload_image_batch(tensor):
-            """將批次圖片張量逐張存檔上傳，回傳 URL 清單"""
-            arr = tensor.cpu().numpy() if isinstance(tensor, torch.Tensor) else tensor
-            if not hasattr(arr, 'shape'):
-                return []
-            if len(arr.shape) == 3:
-                arr = arr[None, ...]
-            urls = []
-            for i in range(arr.shape[0]):
-                single = arr[i:i+1]
-                path = ImageUtils.save_image_tensor(single)
-                if not path:
-                    continue
-                temp_files.append(path)
-                url = api.upload_file(path)
-                if url:
-                    urls.append(url)
-            return urls
+        model_inputs = config.inputs
         
+        # 依輸入型別分派處理；媒體檔案先在本機依序存檔，稍後再一次並行上傳
+        ctx = _InputContext(
+            model_id=model_id,
+            prompt=prompt,
+            image_map={
+                'image': image,
+                'input_reference': input_reference,
+                'first_frame_image': first_frame_image,
+                'last_frame': last_frame,
+                'start_image': start_image,
+            },
+            video=video,
+            audio=audio,
+            kwargs=kwargs,
+            inputs=inputs,
+            temp_files=temp_files,
+            api=api,
+        )
         for input_name, input_config in model_inputs.items():
-            input_type = input_config.get("type")
-            is_required = input_config.get("required", False)
-            
-            if input_type == "STRING" and input_name == "prompt":
-                if prompt or is_required:
-                    inputs[input_name] = prompt
-                    
-            elif input_type == "IMAGE":
-                image_param = None
-                if input_name in image_map:
-                    image_param = image_map[input_name]
-                elif input_name in kwargs:
-                    image_param = kwargs[input_name]
-
-                if image_param is not None:
-                    image_path = ImageUtils.save_image_tensor(image_param)
-                    if image_path:
-                        temp_files.append(image_path)
-                        image_url = api.upload_file(image_path)
-                        if image_url:
-                            inputs[input_name] = image_url
-                elif is_required:
-                    print(f"⚠️ 必要圖片參數 '{input_name}' 未提供")
-
-            elif input_type == "IMAGE_LIST":
-                image_param = None
-                if input_name in image_map:
-                    image_param = image_map[input_name]
-                elif input_name in kwargs:
-                    image_param = kwargs[input_name]
-
-                if image_param is not None:
-                    urls = _upload_image_batch(image_param)
-                    if urls:
-                        inputs[input_name] = urls
-                elif is_required:
-                    print(f"⚠️ 必要圖片清單 '{input_name}' 未提供")
-                    
-            elif input_type == "VIDEO":
-                if video is not None:
-                    video_path = _extract_video_path(video)
-                    if video_path and os.path.exists(video_path):
-                        video_url = api.upload_file(video_path)
-                        if video_url:
-                            inputs[input_name] = video_url
-                            
-            elif input_type == "AUDIO":
-                if audio is not None:
-                    audio_path = AudioUtils.save_audio_from_comfyui(audio)
-                    if audio_path:
-                        temp_files.append(audio_path)
-                        audio_url = api.upload_file(audio_path)
-                        if audio_url:
-                            inputs[input_name] = audio_url
-                            
-            elif input_type in ["COMBO", "FLOAT", "INT", "BOOLEAN"]:
-                value = kwargs.get(input_name) if input_name in kwargs else None
-                if input_type == "COMBO":
-                    allowed = input_config.get("options", [])
-                    if value is not None and allowed and value not in allowed:
-                        fallback = input_config.get("default", allowed[0])
-                        print(f"⚠️ '{input_name}'='{value}' 不被 {model_id} 支援，改用 '{fallback}' (允許值: {allowed})")
-                        value = fallback
-                if value is not None:
-                    inputs[input_name] = value
-                elif is_required and "default" in input_config:
-                    inputs[input_name] = input_config["default"]
+            handler = _INPUT_HANDLERS.get(input_config.get("type"))
+            if handler is not None:
+                handler(input_name, input_config, ctx)
+        upload_jobs, list_jobs = ctx.upload_jobs, ctx.list_jobs
         
-        print(f"📤 執行模型...")
-        print(f"📝 參數: {list(inputs.keys())}")
+        # 並行上傳所有媒體檔案，再依原順序填回 inputs
+        for input_name, paths in list_jobs.items():
+            upload_jobs.extend((input_name, path) for path in paths)
+        if upload_jobs:
+            urls = api.upload_files_concurrently([path for _, path in upload_jobs])
+            for (input_name, path), url in zip(upload_jobs, urls):
+                if not url:
+                    continue
+                if path in ctx.upload_keys:
+                    api.cache_upload(ctx.upload_keys[path], url)
+                if input_name in list_jobs:
+                    inputs.setdefault(input_name, []).append(url)
+                else:
+                    inputs[input_name] = url
         
-        result = api.run_model(model_id, inputs, output_filename)
+        _log.info("📤 執行模型...\n📝 參數: %s", list(inputs.keys()))
         
-        for temp_file in temp_files:
-            cleanup_temp_file(temp_file)
+        result = api.run_model(model_id, inputs, output_filename)
         
         # 處理結果
         video_path = ""
@@ -1045,71 +1350,54 @@ def _run_replicate_model(model_id, prompt="", image=None, input_reference=None,
         
         if isinstance(result, dict):
             # JSON output (e.g., voice-cloning)
-            import json
-            info_text = f"✅ 執行成功\n🤖 {config['display_name']}\n📋 結果:\n{json.dumps(result, indent=2, ensure_ascii=False)}"
-            return ([], [], torch.zeros((1, 512, 512, 3)), info_text, "")
-        elif isinstance(result, list) and len(result) >= 2:
-            video_path = result[0] if result[0] else ""
-            audio_path = result[1] if result[1] else ""
-        elif isinstance(result, str):
-            if result.endswith(('.glb', '.obj', '.fbx', '.gltf')):
-                file_path = result
-            else:
-                video_path = result
-                if config.get("has_audio"):
-                    audio_path = result.replace(".mp4", "_audio.wav")
-                    if not os.path.exists(audio_path):
-                        audio_path = ""
+            info_text = f"✅ 執行成功\n🤖 {config.display_name}\n📋 結果:\n{json.dumps(result, indent=2, ensure_ascii=False)}"
+            return ([], [], _EMPTY_FRAME, info_text, "")
+        handler = _RESULT_HANDLERS.get(type(result))
+        if handler is not None:
+            video_path, audio_path, file_path = handler(result, config)
+        
+        # 存在檢查只做一次，提取第一幀與組裝回傳值共用
+        video_exists = bool(video_path) and os.path.exists(video_path)
+        audio_exists = bool(audio_path) and os.path.exists(audio_path)
         
         # 提取第一幀
-        first_frame = torch.zeros((1, 512, 512, 3))
-        if video_path and os.path.exists(video_path):
+        first_frame = _EMPTY_FRAME
+        if video_exists:
             try:
-                cap = cv2.VideoCapture(video_path)
-                ret, frame = cap.read()
-                cap.release()
-                if ret:
-                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    first_frame = torch.from_numpy(frame_rgb).float() / 255.0
-                    first_frame = first_frame.unsqueeze(0)
+                frame = _extract_first_frame(video_path)
+                if frame is not None:
+                    first_frame = frame
             except Exception:
                 pass
         
         # 載入圖片結果
         if not video_path and not file_path and result and isinstance(result, str) and os.path.exists(result):
             try:
-                img = cv2.imread(result)
+                img = _load_image_tensor(result)
                 if img is not None:
-                    img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-                    first_frame = torch.from_numpy(img_rgb).float() / 255.0
-                    first_frame = first_frame.unsqueeze(0)
+                    first_frame = img
                     file_path = result
             except Exception:
                 pass
         
         # 建立資訊
-        info_lines = [f"✅ 執行成功", f"🤖 {config['display_name']}"]
-        info_lines.append(f"📝 參數: {', '.join(inputs.keys())}")
-        if video_path:
-            info_lines.append(f"📁 影片: {video_path}")
-        if audio_path:
-            info_lines.append(f"🎵 音訊: {audio_path}")
-        if file_path:
-            info_lines.append(f"📁 檔案: {file_path}")
-        info_text = "\n".join(info_lines)
+        info_text = (
+            f"✅ 執行成功\n🤖 {config.display_name}\n📝 參數: {', '.join(inputs)}"
+            + (f"\n📁 影片: {video_path}" if video_path else "")
+            + (f"\n🎵 音訊: {audio_path}" if audio_path else "")
+            + (f"\n📁 檔案: {file_path}" if file_path else "")
+        )
         
-        video_paths = [video_path] if video_path and os.path.exists(video_path) else []
-        audio_paths = [audio_path] if audio_path and os.path.exists(audio_path) else []
+        video_paths = [video_path] if video_exists else []
+        audio_paths = [audio_path] if audio_exists else []
         
         return (video_paths, audio_paths, first_frame, info_text, file_path if file_path else (video_path or ""))
     
     except Exception as e:
-        print(f"❌ 錯誤: {e}")
-        import traceback
-        traceback.print_exc()
-        for temp_file in temp_files:
-            cleanup_temp_file(temp_file)
-        return ([], [], torch.zeros((1, 512, 512, 3)), f"❌ 錯誤: {str(e)}", "")
+        _log.error("❌ 錯誤: %s", e, exc_info=True)
+        return ([], [], _EMPTY_FRAME, f"❌ 錯誤: {str(e)}", "")
+    finally:
+        cleanup_temp_files(temp_files)
 
 
 # ======================